@@ -1,5 +1,5 @@
 """Client modules for external services."""
 
-from algo_trader.clients.ibkr_client import IBKRClient, OrderRejectionError
+from algo_trader.clients.ibkr_client import IBKRClient, OrderRejectionError, OrderConfirmationError
 
-__all__ = ["IBKRClient", "OrderRejectionError"]
+__all__ = ["IBKRClient", "OrderRejectionError", "OrderConfirmationError"]
@@ -1,19 +1,80 @@
 """IBKR Web API client for trading operations."""
 
+import json
+import threading
+import time
 import urllib3
 from typing import Optional
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from urllib3.util.retry import Retry
 
 import os
-import matplotlib
-matplotlib.use('Agg')  # Use non-interactive backend
-import matplotlib.pyplot as plt
 from datetime import datetime
 
 from algo_trader.logging import get_logger
-from algo_trader.utils.config import BASE_URL, VERIFY_SSL, MAX_RETRY_ATTEMPTS, RETRY_DELAY, RETRY_BACKOFF
+from algo_trader.utils.config import (
+    BASE_URL, VERIFY_SSL, MAX_RETRY_ATTEMPTS, RETRY_DELAY, RETRY_BACKOFF,
+    PRICE_CACHE_TTL, POSITIONS_CACHE_TTL, SUMMARY_CACHE_TTL, IBKR_MAX_CONCURRENCY
+)
+from algo_trader.utils.concurrency import run_concurrently
 from algo_trader.utils.decorators import retry
 
+# Fixed endpoint URLs; account-scoped ones are built per call
+AUTH_STATUS_URL = f"{BASE_URL}/iserver/auth/status"
+SUPPRESS_MESSAGES_URL = f"{BASE_URL}/iserver/questions/suppress"
+ACCOUNTS_URL = f"{BASE_URL}/iserver/accounts"
+SECDEF_SEARCH_URL = f"{BASE_URL}/iserver/secdef/search"
+MARKETDATA_HISTORY_URL = f"{BASE_URL}/iserver/marketdata/history"
+PERFORMANCE_URL = f"{BASE_URL}/pa/performance"
+
+# Static request bodies, serialized once
+JSON_HEADERS = {"Content-Type": "application/json"}
+CONFIRM_BODY = json.dumps({"confirmed": True})
+
+# The local gateway uses a self-signed certificate; only silence the warning when not verifying
+if not VERIFY_SSL:
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+
+def _create_session() -> requests.Session:
+    """Create a gateway session with a keep-alive connection pool."""
+    session = requests.Session()
+    session.verify = VERIFY_SSL
+    session.headers.update({"Accept": "application/json", "User-Agent": "algo-trader/1.0"})
+    
+    # Keep gateway sockets alive across calls. This is the only transport retry layer: connect errors
+    # are retried for every method (nothing was sent yet), read errors and 502/503/504 only for GETs,
+    # so a POST that reached the gateway is never replayed. @retry handles semantic errors alone.
+    gateway_retry = Retry(
+        total=MAX_RETRY_ATTEMPTS - 1,
+        backoff_factor=RETRY_DELAY,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({"GET"}),
+        raise_on_status=False
+    )
+    # A blocking pool doubles as the concurrency limit: a thread wanting a connection while
+    # IBKR_MAX_CONCURRENCY requests are in flight waits instead of tripping the gateway's rate limits
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=IBKR_MAX_CONCURRENCY, pool_block=True,
+                          max_retries=gateway_retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_SHARED_SESSION: Optional[requests.Session] = None
+_SHARED_SESSION_LOCK = threading.Lock()
+
+
+def _get_shared_session() -> requests.Session:
+    """Return the process-wide gateway session, creating it on first use."""
+    global _SHARED_SESSION
+    with _SHARED_SESSION_LOCK:
+        if _SHARED_SESSION is None:
+            _SHARED_SESSION = _create_session()
+        return _SHARED_SESSION
+
 
 class OrderRejectionError(Exception):
     """Exception raised when an order is rejected by IBKR."""
@@ -23,15 +84,64 @@ class OrderRejectionError(Exception):
         self.rejection_details = rejection_details or {}
 
 
+class IBKRResponseError(Exception):
+    """Exception raised when the gateway answers successfully but with an unusable body.
+
+    These are the failures worth retrying at the method level; transport errors and
+    5xx statuses on reads are retried by the session adapter, and 4xx statuses are permanent.
+    """
+
+
+class OrderConfirmationError(OrderRejectionError):
+    """Exception raised when a submitted order's confirmation prompt cannot be answered.
+
+    Subclasses OrderRejectionError so the order is never resubmitted by a retry.
+    """
+
+
+# Failures retried by @retry: semantic errors only, so each failure has exactly one retry layer.
+# The session adapter owns transport retries - connect errors for every method, plus read errors
+# and 5xx statuses for GETs. Order placement has no method-level retry: once the POST is written,
+# a dropped connection, read timeout or 5xx may mean the order is live.
+GATEWAY_RETRY_ON = (IBKRResponseError,)
+
+
+def _is_connect_failure(error: requests.RequestException) -> bool:
+    """Whether a request failed before it was sent, i.e. the adapter's connect retries ran out."""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, (NewConnectionError, ConnectTimeoutError))
+
+
 class IBKRClient:
     """Interactive Brokers Web API client."""
     
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.verify = VERIFY_SSL
+    # Fields shared by every market order; conid, side and size are added per order
+    _MARKET_ORDER_TEMPLATE = {
+        "secType": "STK",
+        "orderType": "MKT",
+        "tif": "DAY",
+        "exchange": "SMART",
+        "currency": "USD"
+    }
+    READ_TIMEOUT = (3.0, 10.0)    # (connect, read) seconds for gateway reads
+    ORDER_TIMEOUT = (3.0, 15.0)   # (connect, read) seconds for an order submission
+    PLOT_DPI = 80                 # Raster resolution for the performance chart
+    MAX_POSITION_PAGES = 50       # Safety bound on /portfolio position pages
+    MAX_CONFIRMATIONS = 5         # Chained confirmation prompts answered per order
+    CONFIRM_ATTEMPTS = 3          # Tries per reply POST on network errors
+    CONFIRM_TIMEOUT = (3.0, 5.0)  # (connect, read) seconds for a reply POST
+    
+    def __init__(self, session: Optional[requests.Session] = None):
+        # Pass a session to opt out of the shared gateway connection pool; the caller closes it
+        self.session = session or _get_shared_session()
         self._account_id: Optional[str] = None
+        self._conid_cache: dict[tuple[str, str], int] = {}  # (symbol, secType) -> conid
+        self._price_cache: dict[int, tuple[float, float]] = {}  # conid -> (monotonic time, price)
+        self._summary_cache: dict[str, tuple[float, dict]] = {}  # account_id -> (monotonic time, account summary)
+        self._positions_cache: dict[str, tuple[float, dict[int, float]]] = {}  # account_id -> (monotonic time, {conid: position})
         self.logger = get_logger()
-        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
         
         # Message IDs to suppress for order reply messages
         self.suppress_message_ids = [
@@ -47,92 +157,111 @@ class IBKRClient:
         ]
 
     def initialize(self):
-        """Initialize the client by checking auth and suppressing order reply messages."""
+        """Initialize the client: check auth, suppress order reply messages, resolve the account and its summary."""
         try:
             self._check_auth()
-            self._suppress_order_reply_messages()
+            # Both branches only need an authenticated session, so overlap their round-trips;
+            # the account lookup is chained with a summary fetch that warms the cash/balance cache
+            run_concurrently(
+                self._suppress_order_reply_messages,
+                lambda: self._get_summary(self.get_account_id())
+            )
             self.logger.info("IBKR client initialized successfully")
           
         except Exception as e:
-            self.logger.error(f"Failed to initialize IBKR client: {e}")
+            self.logger.error("Failed to initialize IBKR client: %s", e)
             raise  # Re-raise the original exception
 
-    @retry(MAX_RETRY_ATTEMPTS, RETRY_DELAY, RETRY_BACKOFF)
+    @retry(MAX_RETRY_ATTEMPTS, RETRY_DELAY, RETRY_BACKOFF, retry_on=GATEWAY_RETRY_ON)
     def _check_auth(self):
         """Check if authenticated with IBKR Web API."""
-        response = self.session.get(f"{BASE_URL}/iserver/auth/status")
+        response = self.session.get(AUTH_STATUS_URL, timeout=self.READ_TIMEOUT)
         response.raise_for_status()
         
         is_authenticated = response.json().get("authenticated", False)
         if not is_authenticated:
-            raise Exception("Not authenticated with IBKR Web API")
+            raise IBKRResponseError("Not authenticated with IBKR Web API")
         
         self.logger.info("Authenticated with IBKR Web API")
 
-    @retry(MAX_RETRY_ATTEMPTS, RETRY_DELAY, RETRY_BACKOFF)
+    @retry(MAX_RETRY_ATTEMPTS, RETRY_DELAY, RETRY_BACKOFF, retry_on=GATEWAY_RETRY_ON)
     def _suppress_order_reply_messages(self):
         """Suppress specified order reply messages for the current session."""
-        response = self.session.post(f"{BASE_URL}/iserver/questions/suppress",
-                                     json={"messageIds": self.suppress_message_ids})
+        response = self.session.post(SUPPRESS_MESSAGES_URL,
+                                     data=json.dumps({"messageIds": self.suppress_message_ids}),
+                                     headers=JSON_HEADERS,
+                                     timeout=self.READ_TIMEOUT)
         response.raise_for_status()
 
         status = response.json().get("status")
         if status != 'submitted':
-            raise Exception(f"Failed to suppress order reply messages: unexpected status '{status}'")
+            raise IBKRResponseError(f"Failed to suppress order reply messages: unexpected status '{status}'")
 
-        self.logger.info(f"Successfully suppressed {len(self.suppress_message_ids)} order reply message types")
+        self.logger.info("Successfully suppressed %d order reply message types", len(self.suppress_message_ids))
 
-    @retry(MAX_RETRY_ATTEMPTS, RETRY_DELAY, RETRY_BACKOFF)
+    @retry(MAX_RETRY_ATTEMPTS, RETRY_DELAY, RETRY_BACKOFF, retry_on=GATEWAY_RETRY_ON)
     def get_account_id(self) -> str:
         """Get the primary account ID."""
         if self._account_id:
             return self._account_id
             
-        response = self.session.get(f"{BASE_URL}/iserver/accounts")
+        response = self.session.get(ACCOUNTS_URL, timeout=self.READ_TIMEOUT)
         response.raise_for_status()
         
         data = response.json()
         accounts = data.get("accounts", [])
         if not accounts:
-            raise Exception("No accounts found in response")
+            raise IBKRResponseError("No accounts found in response")
         
         self._account_id = accounts[0]
         if self._account_id is not None and self._account_id != "":
             return self._account_id
 
-        raise Exception("Account ID is empty or None")
+        raise IBKRResponseError("Account ID is empty or None")
 
-    @retry(MAX_RETRY_ATTEMPTS, RETRY_DELAY, RETRY_BACKOFF)
     def get_available_cash(self, account_id: str) -> float:
         """Get available cash for trading."""
-        response = self.session.get(f"{BASE_URL}/iserver/account/{account_id}/summary")
-        response.raise_for_status()
-        
-        data = response.json()
-        available_cash = data.get("availableFunds")
+        available_cash = self._get_summary(account_id).get("availableFunds")
         if available_cash is not None:
             return float(available_cash)
 
-        raise Exception(f"Failed to get available cash - 'availableFunds' not found in response")
+        raise IBKRResponseError(f"Failed to get available cash - 'availableFunds' not found in response")
 
-    @retry(MAX_RETRY_ATTEMPTS, RETRY_DELAY, RETRY_BACKOFF)
     def get_account_balance(self, account_id: str) -> float:
         """Get account balance (equity with loan value)."""
-        response = self.session.get(f"{BASE_URL}/iserver/account/{account_id}/summary")
-        response.raise_for_status()
-        
-        data = response.json()
-        net_liquidation_value = data.get("netLiquidationValue")
+        net_liquidation_value = self._get_summary(account_id).get("netLiquidationValue")
         if net_liquidation_value is not None:
             return float(net_liquidation_value)
 
-        raise Exception(f"Failed to get account balance - 'netLiquidationValue' not found in response")
+        raise IBKRResponseError(f"Failed to get account balance - 'netLiquidationValue' not found in response")
+
+    def _get_summary(self, account_id: str) -> dict:
+        """Get the account summary, cached for SUMMARY_CACHE_TTL seconds so cash and balance share one fetch."""
+        cached = self._summary_cache.get(account_id)
+        if cached and time.monotonic() - cached[0] < SUMMARY_CACHE_TTL:
+            return cached[1]
 
-    @retry(MAX_RETRY_ATTEMPTS, RETRY_DELAY, RETRY_BACKOFF)
+        summary = self._fetch_summary(account_id)
+        self._summary_cache[account_id] = (time.monotonic(), summary)
+        return summary
+
+    @retry(MAX_RETRY_ATTEMPTS, RETRY_DELAY, RETRY_BACKOFF, retry_on=GATEWAY_RETRY_ON)
+    def _fetch_summary(self, account_id: str) -> dict:
+        """Fetch the account summary."""
+        response = self.session.get(f"{BASE_URL}/iserver/account/{account_id}/summary", timeout=self.READ_TIMEOUT)
+        response.raise_for_status()
+        return response.json()
+
+    @retry(MAX_RETRY_ATTEMPTS, RETRY_DELAY, RETRY_BACKOFF, retry_on=GATEWAY_RETRY_ON)
     def get_contract_id(self, symbol: str, sec_type="STK") -> int:
-        """Get contract id for a symbol."""
-        response = self.session.get(f"{BASE_URL}/iserver/secdef/search",
-                                    params={"symbol": symbol, "secType": sec_type})
+        """Get contract id for a symbol. Contract ids never change, so lookups are cached."""
+        cache_key = (symbol, sec_type)
+        if cache_key in self._conid_cache:
+            return self._conid_cache[cache_key]
+
+        response = self.session.get(SECDEF_SEARCH_URL,
+                                    params={"symbol": symbol, "secType": sec_type},
+                                    timeout=self.READ_TIMEOUT)
         response.raise_for_status()
         
         data = response.json()
@@ -140,15 +269,21 @@ class IBKRClient:
             first_result = data[0]
             conid = first_result.get("conid")
             if conid is not None:
-                return int(conid)
+                self._conid_cache[cache_key] = int(conid)
+                return self._conid_cache[cache_key]
 
-        raise Exception(f"Contract ID not found for symbol {symbol}")
+        raise IBKRResponseError(f"Contract ID not found for symbol {symbol}")
 
-    @retry(MAX_RETRY_ATTEMPTS, RETRY_DELAY, RETRY_BACKOFF)
+    @retry(MAX_RETRY_ATTEMPTS, RETRY_DELAY, RETRY_BACKOFF, retry_on=GATEWAY_RETRY_ON)
     def get_price(self, conid: int) -> float:
-        """Get price for a contract."""
-        response = self.session.get(f"{BASE_URL}/iserver/marketdata/history",
-                                    params={"conid": conid, "period": "5d", "bar": "1d", "outsideRth": "true"})
+        """Get price for a contract, reusing a quote fetched within PRICE_CACHE_TTL seconds."""
+        cached = self._price_cache.get(conid)
+        if cached and time.monotonic() - cached[0] < PRICE_CACHE_TTL:
+            return cached[1]
+
+        response = self.session.get(MARKETDATA_HISTORY_URL,
+                                    params={"conid": conid, "period": "5d", "bar": "1d", "outsideRth": "true"},
+                                    timeout=self.READ_TIMEOUT)
         response.raise_for_status()
         data = response.json()
         bars = data.get("data", [])
@@ -156,93 +291,87 @@ class IBKRClient:
             last_bar = bars[-1]
             close_price = last_bar.get("c")
             if close_price is not None:
+                self._price_cache[conid] = (time.monotonic(), float(close_price))
                 return float(close_price)
 
-        raise Exception(f"Price not found for contract ID {conid}")
+        raise IBKRResponseError(f"Price not found for contract ID {conid}")
 
-    @retry(MAX_RETRY_ATTEMPTS, RETRY_DELAY, RETRY_BACKOFF)
     def get_position(self, account_id: str, conid: int) -> float:
         """Get current position for a given contract ID."""
-        response = self.session.get(f"{BASE_URL}/portfolio/{account_id}/positions/0")
-        response.raise_for_status()
-        
-        positions = response.json()
-        if not isinstance(positions, list):
-            raise Exception(f"Unexpected response format for positions")
-        
-        for position in positions:
-            if position.get("conid") == conid:
-                position_value = position.get("position")
-                if position_value is not None:
-                    return float(position_value)
-        
         # Return 0.0 if position not found (no position in this contract)
-        return 0.0
+        return self.get_positions(account_id).get(conid, 0.0)
+
+    def get_positions(self, account_id: str) -> dict[int, float]:
+        """Get all positions for an account keyed by contract ID, cached for POSITIONS_CACHE_TTL seconds."""
+        cached = self._positions_cache.get(account_id)
+        if cached and time.monotonic() - cached[0] < POSITIONS_CACHE_TTL:
+            return cached[1]
+
+        positions = self._fetch_positions(account_id)
+        self._positions_cache[account_id] = (time.monotonic(), positions)
+        return positions
+
+    def invalidate_positions(self, account_id: str) -> None:
+        """Drop cached positions for an account, e.g. after an order changes them."""
+        self._positions_cache.pop(account_id, None)
+
+    @retry(MAX_RETRY_ATTEMPTS, RETRY_DELAY, RETRY_BACKOFF, retry_on=GATEWAY_RETRY_ON)
+    def _fetch_positions(self, account_id: str) -> dict[int, float]:
+        """Fetch all position pages for an account and index them by contract ID."""
+        positions: dict[int, float] = {}
+        for page in range(self.MAX_POSITION_PAGES):
+            response = self.session.get(f"{BASE_URL}/portfolio/{account_id}/positions/{page}", timeout=self.READ_TIMEOUT)
+            response.raise_for_status()
+            
+            page_positions = response.json()
+            if not isinstance(page_positions, list):
+                raise IBKRResponseError(f"Unexpected response format for positions")
+            
+            # Stop only on an empty page: the gateway's page size isn't guaranteed, and treating a
+            # full page as the last would silently drop held positions
+            if not page_positions:
+                return positions
+            
+            positions.update(
+                (int(position["conid"]), float(position["position"]))
+                for position in page_positions
+                if position.get("conid") is not None and position.get("position") is not None
+            )
+        
+        raise IBKRResponseError(f"Positions did not end within {self.MAX_POSITION_PAGES} pages")
 
-    @retry(MAX_RETRY_ATTEMPTS, RETRY_DELAY, RETRY_BACKOFF, no_retry_exceptions=[OrderRejectionError])
     def place_sell_order(self, account_id: str, conid: int, quantity: float) -> Optional[str]:
         """Place a sell market order. Returns order ID if available."""
-        payload = {
-            "orders": [{
-                "conid": conid,
-                "secType": "STK",
-                "orderType": "MKT",
-                "side": "SELL",
-                "quantity": quantity,
-                "tif": "DAY",
-                "exchange": "SMART",
-                "currency": "USD"
-            }]
-        }
+        payload = {"orders": [dict(self._MARKET_ORDER_TEMPLATE, conid=conid, side="SELL", quantity=quantity)]}
         return self._place_market_order(account_id, payload)
 
-    @retry(MAX_RETRY_ATTEMPTS, RETRY_DELAY, RETRY_BACKOFF, no_retry_exceptions=[OrderRejectionError])
     def place_buy_order(self, account_id: str, conid: int, cash_quantity: float) -> Optional[str]:
         """Place a buy market order using cash quantity. Returns order ID if available."""
-        payload = {
-            "orders": [{
-                "conid": conid,
-                "secType": "STK",
-                "orderType": "MKT",
-                "side": "BUY",
-                "cashQty": cash_quantity,
-                "tif": "DAY",
-                "exchange": "SMART",
-                "currency": "USD"
-            }]
-        }
+        payload = {"orders": [dict(self._MARKET_ORDER_TEMPLATE, conid=conid, side="BUY", cashQty=cash_quantity)]}
         return self._place_market_order(account_id, payload)
 
-    @retry(MAX_RETRY_ATTEMPTS, RETRY_DELAY, RETRY_BACKOFF, no_retry_exceptions=[OrderRejectionError])
     def _place_market_order(self, account_id: str, payload: dict) -> Optional[str]:
-        """Place a market order with the given payload. Returns order ID if available."""
+        """Place a market order with the given payload. Returns order ID if available.
+
+        Never retried at the method level: once the POST is sent, retrying would risk a
+        double fill. The session adapter only retries failures to open the connection.
+        """
 
         response = self.session.post(
             f"{BASE_URL}/iserver/account/{account_id}/orders",
-            json=payload
+            json=payload,
+            timeout=self.ORDER_TIMEOUT
         )
         response.raise_for_status()
         
         result = response.json()
-        self.logger.info(f"Order response: {result}")
-        
-        # Check for order rejection
-        if isinstance(result, dict) and "error" in result:
-            error_message = result["error"]
-            rejection_details = result.get("cqe", {})
-            
-            # Extract rejection reason from cqe if available
-            if rejection_details and "post_payload" in rejection_details:
-                rejections = rejection_details["post_payload"].get("rejections", [])
-
-                if rejections:
-                    # Use the first rejection reason as the primary error message
-                    primary_rejection = rejections[0]
-                    raise OrderRejectionError(primary_rejection, rejection_details)
-            
-            # Fallback to the main error message
-            raise OrderRejectionError(error_message, rejection_details)
+        self.logger.info("Order response: %s", result)
+        self._raise_if_rejected(result)
         
+        # Positions and cash change once an order is accepted
+        self.invalidate_positions(account_id)
+        self._summary_cache.pop(account_id, None)
+
         order_id = None
         
         if isinstance(result, list) and len(result) > 0:
@@ -252,12 +381,20 @@ class IBKRClient:
             # Check for order_id in the initial response
             order_id = first_result.get("order_id")
             if order_id:
-                self.logger.info(f"Order ID from initial response: {order_id}")
+                self.logger.info("Order ID from initial response: %s", order_id)
             
             # Handle confirmation if needed
             confirm_id = first_result.get("id")
             if confirm_id:
-                confirmation_order_id = self._confirm_order(confirm_id)
+                # The order is live from here on, so no failure may reach the place_* retry
+                try:
+                    confirmation_order_id = self._confirm_order(confirm_id)
+                except OrderRejectionError:
+                    raise
+                except Exception as e:
+                    raise OrderConfirmationError(
+                        f"Order {confirm_id} was submitted but confirmation failed: {e}; check its status in IBKR"
+                    ) from e
 
                 # Use confirmation order_id if we didn't get one from initial response
                 if order_id is None and confirmation_order_id is not None:
@@ -265,61 +402,100 @@ class IBKRClient:
         
         return order_id
 
-    @retry(MAX_RETRY_ATTEMPTS, RETRY_DELAY, RETRY_BACKOFF, no_retry_exceptions=[OrderRejectionError])
     def _confirm_order(self, confirm_id: str) -> Optional[str]:
-        """Confirm an order that requires confirmation. Returns order_id if available."""
-
-        response = self.session.post(
-            f"{BASE_URL}/iserver/reply/{confirm_id}",
-            json={"confirmed": True}
-        )
-        response.raise_for_status()
-        
-        result = response.json()
-        self.logger.info(f"Order confirmation response: {result}")
-        
-        # Check for order rejection in confirmation response
-        if isinstance(result, dict) and "error" in result:
-            error_message = result["error"]
-            rejection_details = result.get("cqe", {})
+        """Answer confirmation prompts for a submitted order. Returns order_id if available.
+
+        IBKR may chain several prompts, so keep replying until one yields an order ID.
+        Only the reply POST is retried, and only on failures after it was sent (the adapter
+        owns connect retries); any other failure
+        surfaces as OrderConfirmationError so the order is never resubmitted. Once a reply has
+        been sent twice, an error answer may only mean the first one was already accepted, so it
+        is reported as OrderConfirmationError rather than as a rejection.
+        """
+        resent = False
+        for _ in range(self.MAX_CONFIRMATIONS):
+            for attempt in range(1, self.CONFIRM_ATTEMPTS + 1):
+                try:
+                    response = self.session.post(
+                        f"{BASE_URL}/iserver/reply/{confirm_id}",
+                        data=CONFIRM_BODY,
+                        headers=JSON_HEADERS,
+                        timeout=self.CONFIRM_TIMEOUT
+                    )
+                    response.raise_for_status()
+                    resent = resent or attempt > 1
+                    break
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    if _is_connect_failure(e):
+                        raise  # The adapter has already retried connecting
+                    self.logger.warning("Order confirmation failed: %s. Retry %d/%d", e, attempt, self.CONFIRM_ATTEMPTS)
+            else:
+                raise OrderConfirmationError(f"Could not confirm order {confirm_id}; check its status in IBKR")
             
-            # Extract rejection reason from cqe if available
-            if rejection_details and "post_payload" in rejection_details:
-                rejections = rejection_details["post_payload"].get("rejections", [])
-
-                if rejections:
-                    # Use the first rejection reason as the primary error message
-                    primary_rejection = rejections[0]
-                    raise OrderRejectionError(primary_rejection, rejection_details)
+            result = response.json()
+            self.logger.info("Order confirmation response: %s", result)
+            if resent and isinstance(result, dict) and "error" in result:
+                raise OrderConfirmationError(
+                    f"Order reply {confirm_id} was resent and answered with an error ({result['error']}); "
+                    "the order may be live, check order status in IBKR"
+                )
+            self._raise_if_rejected(result)
             
-            # Fallback to the main error message
-            raise OrderRejectionError(error_message, rejection_details)
-        
-        # Extract order_id from confirmation response
-        order_id = None
-        if isinstance(result, list) and len(result) > 0:
-            order_id = result[0].get("order_id")
-            if order_id:
-                self.logger.info(f"Order ID from confirmation: {order_id}")
-        elif isinstance(result, dict):
-            order_id = result.get("order_id")
+            # Extract order_id, or the next prompt to answer, from the confirmation response
+            reply = result[0] if isinstance(result, list) and result else result
+            if not isinstance(reply, dict):
+                break
+            
+            order_id = reply.get("order_id")
             if order_id:
-                self.logger.info(f"Order ID from confirmation: {order_id}")
+                self.logger.info("Order ID from confirmation: %s", order_id)
+                self.logger.info("Order confirmed")
+                return order_id
+            
+            confirm_id = reply.get("id")
+            if not confirm_id:
+                break
+        else:
+            raise OrderConfirmationError(
+                f"Order still awaiting confirmation {confirm_id} after {self.MAX_CONFIRMATIONS} prompts; check its status in IBKR"
+            )
         
         self.logger.info("Order confirmed")
-        return order_id
+        return None
+
+    @staticmethod
+    def _raise_if_rejected(result) -> None:
+        """Raise OrderRejectionError if an order or reply response reports an error."""
+        if not (isinstance(result, dict) and "error" in result):
+            return
+        
+        error_message = result["error"]
+        rejection_details = result.get("cqe", {})
+        
+        # Extract rejection reason from cqe if available
+        if rejection_details and "post_payload" in rejection_details:
+            rejections = rejection_details["post_payload"].get("rejections", [])
+
+            if rejections:
+                # Use the first rejection reason as the primary error message
+                primary_rejection = rejections[0]
+                raise OrderRejectionError(primary_rejection, rejection_details)
+        
+        # Fallback to the main error message
+        raise OrderRejectionError(error_message, rejection_details)
 
     def get_performance(self, account_id: str, notifications_service) -> None:
         """Get account performance for the last 1 year, plot it, and send via Telegram."""
         try:
             # --- Account NAV performance via /pa/performance ---
             response = self.session.post(
-                f"{BASE_URL}/pa/performance",
+                PERFORMANCE_URL,
                 json={
                     "acctIds": [account_id],
                     "period": "1Y",
                     "freq": "D"
-                }
+                },
+                timeout=self.READ_TIMEOUT
             )
             response.raise_for_status()
 
@@ -338,7 +514,7 @@ class IBKRClient:
                     dates.append(date_obj)
                     values.append(float(nav_val))
                 except Exception as e:
-                    self.logger.warning(f"Failed parsing NAV row: {e}")
+                    self.logger.warning("Failed parsing NAV row: %s", e)
                     continue
 
             # For account U20831848, exclude data prior to Jan 10, 2026
@@ -348,16 +524,18 @@ class IBKRClient:
                 if filtered:
                     dates, values = zip(*filtered)
                     dates, values = list(dates), list(values)
-                    self.logger.info(f"Filtered NAV data to {len(dates)} entries from {dates[0].date()} onward")
+                    self.logger.info("Filtered NAV data to %d entries from %s onward", len(dates), dates[0].date())
 
             if not dates or not values:
                 self.logger.warning("No valid performance data to plot")
-                self.logger.warning(f"Full response: {data}")
+                self.logger.warning("Full response: %s", data)
                 return
 
             # Simulate buy and hold using beginning balance
-            dates_bh_spy, values_bh_spy = self._get_buy_and_hold_series("SPY", values[0], dates[0])
-            dates_bh_qqq, values_bh_qqq = self._get_buy_and_hold_series("QQQ", values[0], dates[0])
+            (dates_bh_spy, values_bh_spy), (dates_bh_qqq, values_bh_qqq) = run_concurrently(
+                lambda: self._get_buy_and_hold_series("SPY", values[0], dates[0]),
+                lambda: self._get_buy_and_hold_series("QQQ", values[0], dates[0]),
+            )
 
             # Calculate percentage returns
             account_pct_return = ((values[-1] - values[0]) / values[0]) * 100
@@ -366,7 +544,11 @@ class IBKRClient:
             # spy_pct_return = self._get_symbol_annual_return("SPY")
             # qqq_pct_return = self._get_symbol_annual_return("QQQ")
 
-            # Plot
+            # Plot (matplotlib is imported here so callers that never plot skip its import cost)
+            import matplotlib
+            matplotlib.use('Agg')  # Use non-interactive backend
+            import matplotlib.pyplot as plt
+
             fig, ax = plt.subplots(figsize=(16, 9))
             ax.plot(dates, values, linewidth=2, color='gray', label='Account')
             ax.plot(dates_bh_spy, values_bh_spy, linewidth=2, color='green', linestyle='--', label='Buy & Hold SPY')
@@ -385,7 +567,8 @@ class IBKRClient:
             plt.tight_layout()
 
             file_name = 'performance.png'
-            plt.savefig(file_name, dpi=300, bbox_inches='tight')
+            # 16x9in at 80 dpi is 1280x720, the largest size Telegram keeps for photos
+            plt.savefig(file_name, dpi=self.PLOT_DPI, bbox_inches='tight')
             plt.close(fig)
 
             # Build caption
@@ -414,12 +597,10 @@ class IBKRClient:
             )
 
             notifications_service.send_telegram_image(file_name, caption)
-
-            if os.path.exists(file_name):
-                os.remove(file_name)
+            os.remove(file_name)
 
         except Exception as e:
-            self.logger.error(f"Failed to get performance data: {e}")
+            self.logger.error("Failed to get performance data: %s", e)
 
     def _get_buy_and_hold_series(self, symbol: str, starting_balance: float, start_date: datetime):
         """
@@ -433,14 +614,15 @@ class IBKRClient:
 
             conid = self.get_contract_id(symbol)
             response = self.session.get(
-                f"{BASE_URL}/iserver/marketdata/history",
-                params={"conid": conid, "period": period, "bar": "1d", "outsideRth": "true"}
+                MARKETDATA_HISTORY_URL,
+                params={"conid": conid, "period": period, "bar": "1d", "outsideRth": "true"},
+                timeout=self.READ_TIMEOUT
             )
             response.raise_for_status()
 
             bars = response.json().get("data", [])
             if len(bars) < 2:
-                self.logger.warning(f"Not enough price history for {symbol}")
+                self.logger.warning("Not enough price history for %s", symbol)
                 return [], []
 
             # Filter bars to only include dates on or after start_date
@@ -465,7 +647,7 @@ class IBKRClient:
             return dates, sim_values
 
         except Exception as e:
-            self.logger.warning(f"Failed to build buy-and-hold series for {symbol}: {e}")
+            self.logger.warning("Failed to build buy-and-hold series for %s: %s", symbol, e)
             return [], []
 
     def _get_symbol_annual_return(self, symbol: str) -> Optional[float]:
@@ -473,14 +655,15 @@ class IBKRClient:
         try:
             conid = self.get_contract_id(symbol)
             response = self.session.get(
-                f"{BASE_URL}/iserver/marketdata/history",
-                params={"conid": conid, "period": "1y", "bar": "1d", "outsideRth": "true"}
+                MARKETDATA_HISTORY_URL,
+                params={"conid": conid, "period": "1y", "bar": "1d", "outsideRth": "true"},
+                timeout=self.READ_TIMEOUT
             )
             response.raise_for_status()
 
             bars = response.json().get("data", [])
             if len(bars) < 2:
-                self.logger.warning(f"Not enough price history for {symbol}")
+                self.logger.warning("Not enough price history for %s", symbol)
                 return None
 
             start_price = float(bars[0].get("c"))
@@ -488,5 +671,5 @@ class IBKRClient:
             return ((end_price - start_price) / start_price) * 100
 
         except Exception as e:
-            self.logger.warning(f"Failed to get annual return for {symbol}: {e}")
+            self.logger.warning("Failed to get annual return for %s: %s", symbol, e)
             return None
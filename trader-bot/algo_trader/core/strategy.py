@@ -23,46 +23,96 @@ Red dots indicate persistent selling pressure and weaker market sentiment.
 """
 import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 import pandas_market_calendars as mcal
 from datetime import date
+from functools import lru_cache
+import io
+import mimetypes
 import os
 
-import boto3
+import requests
 from botocore.exceptions import ClientError
+from requests.adapters import HTTPAdapter
 
 from algo_trader.logging import get_logger
 from algo_trader.models import Signal, Severity
 from algo_trader.notifications import NotificationService
 
 from algo_trader.utils.config import MAX_RETRY_ATTEMPTS, RETRY_DELAY, RETRY_BACKOFF, S3_BUCKET_NAME, S3_REGION, S3_KEY_PREFIX
+from algo_trader.utils.aws import get_client, is_bucket_verified, mark_bucket_verified
+from algo_trader.utils.concurrency import run_concurrently
 from algo_trader.utils.decorators import retry
+from algo_trader.utils.excel import write_excel
+
+# Rows used for indicators: one trading year, well above the 50 + 5 + 10 day lookback
+SIGNAL_WINDOW = 252
+
+MARKET_TZ = "US/Eastern"
+
+STOOQ_NDX_URL = "https://stooq.com/q/l/?s=%5Endx&f=sd2t2ohlcv&h&e=csv"
+
+
+def _rolling(values: np.ndarray, window: int, func) -> np.ndarray:
+    """Apply func over each trailing window, NaN-padded like pandas rolling(window)."""
+    out = np.full(len(values), np.nan)
+    if len(values) >= window:
+        out[window - 1:] = func(sliding_window_view(values.astype(float), window), axis=1)
+    return out
+
+
+@lru_cache(maxsize=1)
+def _get_nyse_calendar() -> mcal.MarketCalendar:
+    """Build the NYSE calendar once per process; its rule tables are costly to construct."""
+    return mcal.get_calendar("NYSE")
+
+
+def _create_http_session() -> requests.Session:
+    """Create a pooled session so market data requests reuse one gzip-enabled connection."""
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+    return session
+
 
 class TradingStrategy:
 
+    _SESSION = _create_http_session()
+
     def __init__(self):
         self.logger = get_logger()
         self.notifications = NotificationService()
-        self.s3 = boto3.client("s3", region_name=S3_REGION)
+        self.s3 = get_client("s3", S3_REGION)
         self.bucket_name = S3_BUCKET_NAME
         self._bucket_initialized = False
+        self._signal_cache: dict[tuple[str, date], Signal] = {}  # One signal per account per trading day
 
     @retry(MAX_RETRY_ATTEMPTS, RETRY_DELAY, RETRY_BACKOFF)
     def get_signal(self, account_id: str) -> Signal:
         """Check market health using NDX price and volume history."""
         try:
+            today = pd.Timestamp.now(tz=MARKET_TZ).date()
+            # today = date(2026, 3, 30) # override for testing purposes
+
+            # The signal only changes with the trading day, so repeat calls skip the download and recompute
+            cached_signal = self._signal_cache.get((account_id, today))
+            if cached_signal is not None:
+                return cached_signal
+
             # Initialize S3 bucket with account ID
             self._initialize_bucket(account_id)
 
-            today = pd.Timestamp.now(tz='US/Eastern').date()
-            # today = date(2026, 3, 30) # override for testing purposes
-
-            nyse = mcal.get_calendar('NYSE')
-            schedule = nyse.schedule(today, today)
-            if schedule.empty:
+            # One schedule lookup answers both "is the market open today" and "latest completed session"
+            recent_sessions = _get_nyse_calendar().schedule(
+                start_date=today - pd.Timedelta(days=10),
+                end_date=today
+            )
+            session_dates = recent_sessions.index.date
+            if today not in session_dates:
                 signal = Signal.CLOSED
                 message = f"Market Signal: {signal.name} as of {today}"
                 self.logger.info(message)
                 self.notifications.send_notification(account_id, Severity.INFO, message)
+                self._signal_cache[(account_id, today)] = signal
                 return signal
 
             self.logger.info("Loading NDX price history from S3")
@@ -71,30 +121,21 @@ class TradingStrategy:
             df = self._load_csv_from_s3(csv_s3_key)
 
             # Determine the latest completed trading session
-            recent_sessions = nyse.schedule(
-                start_date=pd.Timestamp.now(tz='US/Eastern').date() - pd.Timedelta(days=10),
-                end_date=pd.Timestamp.now(tz='US/Eastern').date()
-            )
-
             # Exclude today if market is still open or hasn't opened yet
-            recent_sessions = recent_sessions[
-                recent_sessions.index.date < pd.Timestamp.now(tz='US/Eastern').date()
-            ]
-
-            latest_session = recent_sessions.index[-1].date()
-            self.logger.info(f"Latest completed trading session: {latest_session}")
+            latest_session = session_dates[session_dates < today][-1]
+            self.logger.info("Latest completed trading session: %s", latest_session)
 
-            df['Date'] = pd.to_datetime(df['Date'])
             last_date_in_df = df['Date'].iloc[-1].date()
-            self.logger.info(f"Last date in price history: {last_date_in_df}")
+            self.logger.info("Last date in price history: %s", last_date_in_df)
 
             # Fetch incremental data if the latest session is not in the DataFrame
             if last_date_in_df < latest_session:
-                self.logger.info(f"Price history is stale — fetching latest row from Stooq")
+                self.logger.info("Price history is stale — fetching latest row from Stooq")
 
                 try:
-                    url = "https://stooq.com/q/l/?s=%5Endx&f=sd2t2ohlcv&h&e=csv"
-                    new_df = pd.read_csv(url)
+                    response = self._SESSION.get(STOOQ_NDX_URL, timeout=30)
+                    response.raise_for_status()
+                    new_df = pd.read_csv(io.BytesIO(response.content))
 
                     # Transform columns to match schema: Date, Open, High, Low, Close, Volume
                     new_df['Date'] = pd.to_datetime(new_df['Date'])
@@ -103,11 +144,11 @@ class TradingStrategy:
                     if not new_df.empty:
                         df = pd.concat([df, new_df], ignore_index=True).drop_duplicates(subset='Date')
                         df = df.sort_values('Date').reset_index(drop=True)
-                        self.logger.info(f"Appended {len(new_df)} new row(s) from Stooq")
+                        self.logger.info("Appended %d new row(s) from Stooq", len(new_df))
                     else:
                         self.logger.info("No new rows returned from Stooq")
                 except Exception as e:
-                    self.logger.warning(f"Failed to fetch incremental data from Stooq: {e}")
+                    self.logger.warning("Failed to fetch incremental data from Stooq: %s", e)
 
             # Ideally the bot should run before market open.
             # If it runs after market open, this step removes the row for the current date.
@@ -116,61 +157,79 @@ class TradingStrategy:
 
             df.to_csv(csv_filename, index=False)
 
-            # Indicators
-            df["SMA50"] = df["Close"].rolling(50).mean()
-            df["Vol_SMA50"] = df["Volume"].rolling(50).mean()
-            df["PrevClose"] = df["Close"].shift(1)
+            # Only the trailing window affects today's signal; the full history is kept in the CSV above
+            df = df.tail(SIGNAL_WINDOW).reset_index(drop=True)
+
+            # Indicators, computed on raw arrays and assigned to df in one step
+            close = df["Close"].to_numpy(dtype=float)
+            high = df["High"].to_numpy(dtype=float)
+            low = df["Low"].to_numpy(dtype=float)
+            volume = df["Volume"].to_numpy(dtype=float)
 
-            # True Range & Average True Range
-            df["TR"] = df[["High", "PrevClose"]].max(axis=1) - df[["Low", "PrevClose"]].min(axis=1)
-            df["ATR"] = df["TR"].rolling(14).mean()
+            sma50 = _rolling(close, 50, np.mean)
+            vol_sma50 = _rolling(volume, 50, np.mean)
+            prev_close = np.concatenate(([np.nan], close[:-1]))
 
-            # Closing Range
-            df["CR"] = (df["Close"] - df["Low"]) / (df["High"] - df["Low"])
-            df["CR"] = df["CR"].replace([np.inf, -np.inf], np.nan)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                # True Range & Average True Range (fmax/fmin skip the missing first PrevClose)
+                tr = np.fmax(high, prev_close) - np.fmin(low, prev_close)
+                atr = _rolling(tr, 14, np.mean)
 
-            # Up/Down Volume Ratio
-            df["UpVol"] = np.where(df["Close"] > df["PrevClose"], df["Volume"], 0)
-            df["DownVol"] = np.where(df["Close"] < df["PrevClose"], df["Volume"], 0)
-            df["UDVR"] = df["UpVol"].rolling(50).sum() / df["DownVol"].rolling(50).sum()
+                # Closing Range
+                cr = (close - low) / (high - low)
+                cr[np.isinf(cr)] = np.nan
+
+                # Up/Down Volume Ratio
+                up_vol = np.where(close > prev_close, volume, 0)
+                down_vol = np.where(close < prev_close, volume, 0)
+                udvr = _rolling(up_vol, 50, np.sum) / _rolling(down_vol, 50, np.sum)
+
+            below_sma = close < sma50
 
             # Black Dot
-            cond_day = (df["TR"] > 1.5 * df["ATR"]) & (df["CR"] < 0.10) & (df["Volume"] > df["Vol_SMA50"])
-            black_cond = cond_day.rolling(5).max() > 0
-            df["BlackDot"] = (df["Close"] < df["SMA50"]) & black_cond
+            cond_day = (tr > 1.5 * atr) & (cr < 0.10) & (volume > vol_sma50)
+            black_dot = below_sma & (_rolling(cond_day, 5, np.max) > 0)
 
             # Red Dot
-            udvr_count = (df["UDVR"] < 1).rolling(5).sum()
-            df["RedDot"] = (df["Close"] < df["SMA50"]) & (udvr_count >= 3)
+            udvr_count = _rolling(udvr < 1, 5, np.sum)
+            red_dot = below_sma & (udvr_count >= 3)
 
             # Bullish
-            any_dots_last10 = (df["BlackDot"] | df["RedDot"]).rolling(10).max()
-            df["Bullish"] = (any_dots_last10 == 0)
+            any_dots_last10 = _rolling(black_dot | red_dot, 10, np.max)
+
+            df = df.assign(
+                SMA50=sma50, Vol_SMA50=vol_sma50, PrevClose=prev_close, TR=tr, ATR=atr, CR=cr,
+                UpVol=up_vol, DownVol=down_vol, UDVR=udvr,
+                BlackDot=black_dot, RedDot=red_dot, Bullish=any_dots_last10 == 0
+            )
 
             # Save Excel file locally
             excel_filename = "market-outlook.xlsx"
-            df.to_excel(excel_filename, index=False)
+            write_excel(df, excel_filename)
             
             # Upload both files to S3
             csv_s3_key = f"{S3_KEY_PREFIX}{csv_filename}"
             excel_s3_key = f"{S3_KEY_PREFIX}{excel_filename}"
             
-            csv_uploaded = self._upload_file_to_s3(csv_filename, csv_s3_key)
-            excel_uploaded = self._upload_file_to_s3(excel_filename, excel_s3_key)
+            # The uploads are independent, so run them side by side on the shared S3 client
+            csv_uploaded, excel_uploaded = run_concurrently(
+                lambda: self._upload_file_to_s3(csv_filename, csv_s3_key),
+                lambda: self._upload_file_to_s3(excel_filename, excel_s3_key),
+            )
             
             if not csv_uploaded:
-                self.logger.warning(f"Failed to upload {csv_filename} to S3")
+                self.logger.warning("Failed to upload %s to S3", csv_filename)
             if not excel_uploaded:
-                self.logger.warning(f"Failed to upload {excel_filename} to S3")
+                self.logger.warning("Failed to upload %s to S3", excel_filename)
             
             # Clean up local files only if S3 upload was successful
             try:
-                if csv_uploaded and os.path.exists(csv_filename):
+                if csv_uploaded:
                     os.remove(csv_filename)
-                if excel_uploaded and os.path.exists(excel_filename):
+                if excel_uploaded:
                     os.remove(excel_filename)
             except OSError as e:
-                self.logger.warning(f"Failed to clean up local files: {e}")
+                self.logger.warning("Failed to clean up local files: %s", e)
 
             # Determine market signal
             last_row = df.iloc[-1]
@@ -194,10 +253,11 @@ class TradingStrategy:
             message = f"Market Signal: {signal.name} as of {asof_date}"
             self.logger.info(message)
             self.notifications.send_notification(account_id, Severity.INFO, message)
+            self._signal_cache[(account_id, today)] = signal
             return signal
 
         except Exception as e:
-            self.logger.error(f"Failed to get market signal: {e}")
+            self.logger.exception("Failed to get market signal: %s", e)
             raise  # Re-raise the original exception
 
     def _initialize_bucket(self, account_id: str) -> None:
@@ -212,13 +272,17 @@ class TradingStrategy:
 
     def _ensure_bucket_exists(self) -> None:
         """Create S3 bucket if it doesn't exist."""
+        if is_bucket_verified(self.bucket_name):
+            return
+
         try:
             self.s3.head_bucket(Bucket=self.bucket_name)
+            mark_bucket_verified(self.bucket_name)
         except ClientError as e:
             if e.response["Error"]["Code"] == "404":
                 self._create_bucket()
             else:
-                self.logger.error(f"Error checking bucket: {e}")
+                self.logger.error("Error checking bucket: %s", e)
                 raise  # Re-raise non-404 errors
 
     def _create_bucket(self) -> None:
@@ -232,9 +296,10 @@ class TradingStrategy:
                     Bucket=self.bucket_name,
                     CreateBucketConfiguration={"LocationConstraint": S3_REGION}
                 )
-            self.logger.info(f"Created S3 bucket: {self.bucket_name}")
+            self.logger.info("Created S3 bucket: %s", self.bucket_name)
+            mark_bucket_verified(self.bucket_name)
         except ClientError as e:
-            self.logger.error(f"Failed to create bucket: {e}")
+            self.logger.error("Failed to create bucket: %s", e)
             raise  # Re-raise the exception
 
     @retry(MAX_RETRY_ATTEMPTS, RETRY_DELAY, RETRY_BACKOFF)
@@ -242,19 +307,22 @@ class TradingStrategy:
         """Download a CSV from S3 and return it as a DataFrame."""
         try:
             response = self.s3.get_object(Bucket=self.bucket_name, Key=s3_key)
-            df = pd.read_csv(response["Body"])
-            self.logger.info(f"Loaded {len(df)} rows from s3://{self.bucket_name}/{s3_key}")
+            df = pd.read_csv(response["Body"], parse_dates=["Date"], date_format="ISO8601")
+            self.logger.info("Loaded %d rows from s3://%s/%s", len(df), self.bucket_name, s3_key)
             return df
         except ClientError as e:
-            self.logger.error(f"Failed to load CSV from S3 ({s3_key}): {e}")
+            self.logger.error("Failed to load CSV from S3 (%s): %s", s3_key, e)
             raise
 
     @retry(MAX_RETRY_ATTEMPTS, RETRY_DELAY, RETRY_BACKOFF)
     def _upload_file_to_s3(self, local_file_path: str, s3_key: str) -> bool:
         """Upload a local file to S3."""
         try:
-            self.s3.upload_file(local_file_path, self.bucket_name, s3_key)
+            # Artifacts are small, so a single PUT beats upload_file's multipart transfer manager
+            content_type = mimetypes.guess_type(local_file_path)[0] or "application/octet-stream"
+            with open(local_file_path, "rb") as f:
+                self.s3.put_object(Bucket=self.bucket_name, Key=s3_key, Body=f, ContentType=content_type)
             return True
         except ClientError as e:
-            self.logger.error(f"Failed to upload {local_file_path} to S3: {e}")
+            self.logger.error("Failed to upload %s to S3: %s", local_file_path, e)
             return False
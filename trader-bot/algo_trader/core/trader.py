@@ -5,6 +5,7 @@ from algo_trader.core.strategy import TradingStrategy
 from algo_trader.logging import get_logger, TradeLogger
 from algo_trader.models import Trade, Signal, Severity
 from algo_trader.notifications import NotificationService
+from algo_trader.utils.concurrency import run_concurrently
 from algo_trader.utils.config import SYMBOL, COMMISSION_TYPE
 
 # Trading constants
@@ -20,6 +21,22 @@ FIXED_RATE_PER_SHARE = 0.005      # $0.005 per share
 FIXED_MIN_COMMISSION = 1.00       # Minimum per order
 
 
+def _tiered_commission(quantity: float, price: float) -> float:
+    """IBKR Pro tiered: per-share rate, with a per-order minimum, capped at 1% of trade value."""
+    commission = max(quantity * TIERED_RATE_PER_SHARE, TIERED_MIN_COMMISSION)
+    return min(commission, quantity * price * TIERED_MAX_COMMISSION_PCT)
+
+
+def _fixed_commission(quantity: float, price: float) -> float:
+    """IBKR Pro fixed: per-share rate with a per-order minimum."""
+    return max(quantity * FIXED_RATE_PER_SHARE, FIXED_MIN_COMMISSION)
+
+
+# COMMISSION_TYPE is fixed for the process, so resolve its formula once instead of on every trade
+_COMMISSION_FUNCTIONS = {"TIERED": _tiered_commission, "FIXED": _fixed_commission}
+_COMMISSION_FUNCTION = _COMMISSION_FUNCTIONS.get(COMMISSION_TYPE.upper())
+
+
 class Trader:
     """Main trader class that orchestrates trading operations."""
     
@@ -43,45 +60,63 @@ class Trader:
             self.logger.info("----------------BEGIN----------------")
 
             signal = self.strategy.get_signal(self.account_id)
+
+            if signal == Signal.CLOSED:
+                # No order can be placed, so skip the quote and position reads
+                account_balance, _ = run_concurrently(
+                    lambda: self.client.get_account_balance(self.account_id),
+                    lambda: self.client.get_performance(self.account_id, self.notifications),
+                )
+                self.logger.info("-------------------------------------")
+                self.logger.info("Account Balance: $%.2f", account_balance)
+                self.logger.info("Market is closed - no trading action taken")
+                return
+
+            # Only a tradeable signal needs the contract, so it is resolved after the CLOSED check
             contract_id = self.client.get_contract_id(SYMBOL)
-            price = self.client.get_price(contract_id)
-            current_position = self.client.get_position(self.account_id, contract_id)
-            account_balance = self.client.get_account_balance(self.account_id)
+
+            # Independent gateway reads, so overlap their round-trips (get_performance handles its own errors)
+            price, current_position, account_balance, _ = run_concurrently(
+                lambda: self.client.get_price(contract_id),
+                lambda: self.client.get_position(self.account_id, contract_id),
+                lambda: self.client.get_account_balance(self.account_id),
+                lambda: self.client.get_performance(self.account_id, self.notifications),
+            )
 
             self.logger.info("-------------------------------------")
-            self.logger.info(f"{SYMBOL} Price: ${price:.2f}")
-            self.logger.info(f"Current Position: {current_position} shares")
-            self.logger.info(f"Account Balance: ${account_balance:,.2f}")
-            self.client.get_performance(self.account_id, self.notifications)
+            self.logger.info("%s Price: $%.2f", SYMBOL, price)
+            self.logger.info("Current Position: %s shares", current_position)
+            self.logger.info("Account Balance: $%.2f", account_balance)
 
             if signal == Signal.BULLISH:
                 self._handle_bullish_signal(self.account_id, contract_id, price)
             elif signal == Signal.BEARISH or signal == Signal.NEUTRAL:
                 self._handle_bearish_or_neutral_signal(self.account_id, contract_id, price, current_position)
-            elif signal == Signal.CLOSED:
-                self.logger.info("Market is closed - no trading action taken")
             else:
-                self.logger.warning(f"Unknown signal received: {signal}")
+                self.logger.warning("Unknown signal received: %s", signal)
 
         except Exception as e:
-            self.logger.error(f"Trade execution failed: {e}")
+            self.logger.error("Trade execution failed: %s", e)
             self.notifications.send_notification(self.account_id, Severity.ERROR, f"Trade execution failed: {e}")
         finally:
+            self.trade_logger.flush()  # Upload any batched trades before their notifications are drained
+            self.notifications.flush()
             self.logger.info("-----------------END-----------------")
+            self.logger.flush()
     
     def _handle_bullish_signal(self, account_id: str, contract_id: int, price: float) -> None:
         """Handle bullish signal by buying the symbol."""
 
         available_cash = self.client.get_available_cash(account_id)
-        self.logger.info(f"Available Cash: ${available_cash:.2f}")
+        self.logger.info("Available Cash: $%.2f", available_cash)
         
         if available_cash > MIN_CASH_THRESHOLD:
             quantity = available_cash / price
-            commission = self._get_ibkr_commission(quantity, price, COMMISSION_TYPE)
+            commission = self._get_ibkr_commission(quantity, price)
             amount = available_cash - commission - CASH_BUFFER
             
-            self.logger.info(f"Commission Estimate: ${commission:.2f}")
-            self.logger.info(f"Placing BUY order for ${amount:.2f} of {SYMBOL}")
+            self.logger.info("Commission Estimate: $%.2f", commission)
+            self.logger.info("Placing BUY order for $%.2f of %s", amount, SYMBOL)
             self.logger.info("-------------------------------------")
             
             try:
@@ -108,7 +143,7 @@ class Trader:
         if current_position > 0:
             quantity = current_position
             amount = quantity * price
-            self.logger.info(f"Placing SELL order for {quantity} shares of {SYMBOL}")
+            self.logger.info("Placing SELL order for %s shares of %s", quantity, SYMBOL)
             self.logger.info("-------------------------------------")
 
             try:
@@ -128,23 +163,12 @@ class Trader:
                 raise  # Re-raise to be caught by the main exception handler
 
         else:
-            self.logger.info(f"No {SYMBOL} position to sell.")
+            self.logger.info("No %s position to sell.", SYMBOL)
 
-    def _get_ibkr_commission(self, quantity: float, price: float, commission_type: str) -> float:
+    def _get_ibkr_commission(self, quantity: float, price: float) -> float:
         """Get IBKR Pro commission estimate."""
 
-        trade_value = quantity * price
-
-        if commission_type.upper() == "TIERED":
-            commission = quantity * TIERED_RATE_PER_SHARE
-            commission = max(commission, TIERED_MIN_COMMISSION)
-            commission = min(commission, trade_value * TIERED_MAX_COMMISSION_PCT)
-
-        elif commission_type.upper() == "FIXED":
-            commission = quantity * FIXED_RATE_PER_SHARE
-            commission = max(commission, FIXED_MIN_COMMISSION)
-
-        else:
+        if _COMMISSION_FUNCTION is None:
             raise ValueError("Invalid commission_type. Must be 'TIERED' or 'FIXED'.")
 
-        return round(commission, 2)
+        return round(_COMMISSION_FUNCTION(quantity, price), 2)
@@ -1,10 +1,19 @@
 """CloudWatch logging functionality for AWS EC2 deployment."""
 
+import atexit
+import http.client
 import json
 import logging
+import logging.handlers
+import queue
 import socket
 import sys
+import threading
+import time
+import traceback
+import weakref
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional
 
 import boto3
@@ -12,19 +21,73 @@ from botocore.exceptions import ClientError, NoCredentialsError
 
 from algo_trader.utils.config import CLOUDWATCH_LOG_GROUP, CLOUDWATCH_REGION
 
-EC2_METADATA_URL = "http://169.254.169.254/latest/dynamic/instance-identity/document"
+EC2_METADATA_HOST = "169.254.169.254"
+EC2_METADATA_TOKEN_PATH = "/latest/api/token"
+EC2_METADATA_DOCUMENT_PATH = "/latest/dynamic/instance-identity/document"
+
+# Live loggers, tracked weakly so registering for the exit shutdown doesn't keep them alive
+_instances: "weakref.WeakSet[CloudWatchLogger]" = weakref.WeakSet()
+
+
+def _close_at_exit() -> None:
+    """Send every live logger's queued events and stop its console listener."""
+    for cloudwatch_logger in list(_instances):
+        cloudwatch_logger.close()
+
+
+# Registered at import, before any module that logs from its own exit handler (trade_logger imports
+# this module first). atexit runs handlers in reverse, so this one runs last and sees their lines.
+atexit.register(_close_at_exit)
+
+
+@lru_cache(maxsize=1)
+def _get_instance_id() -> str:
+    """Get EC2 instance ID once per process via IMDSv2, falling back to hostname if not on EC2."""
+    try:
+        # Cheap reachability probe so non-EC2 hosts don't wait out the HTTP timeout
+        socket.create_connection((EC2_METADATA_HOST, 80), timeout=0.1).close()
+    except OSError:
+        return socket.gethostname()
+    
+    # IMDSv2: PUT for a session token, then GET the document with it on the same connection
+    connection = http.client.HTTPConnection(EC2_METADATA_HOST, timeout=0.25)
+    try:
+        connection.request("PUT", EC2_METADATA_TOKEN_PATH, headers={"X-aws-ec2-metadata-token-ttl-seconds": "60"})
+        token_response = connection.getresponse()
+        token = token_response.read().decode()
+        if token_response.status != 200:
+            return socket.gethostname()
+        
+        connection.request("GET", EC2_METADATA_DOCUMENT_PATH, headers={"X-aws-ec2-metadata-token": token})
+        document_response = connection.getresponse()
+        if document_response.status != 200:
+            return socket.gethostname()
+        metadata = json.loads(document_response.read().decode())
+        return metadata.get("instanceId", socket.gethostname())
+    except Exception:
+        return socket.gethostname()
+    finally:
+        connection.close()
 
 
 class CloudWatchLogger:
     """Dual logger that writes to both CloudWatch and console."""
     
+    BATCH_SIZE = 25       # Queued events sent per CloudWatch call
+    FLUSH_INTERVAL = 2.0  # Seconds the worker waits for a batch to fill
+    
     def __init__(self, log_group: str = None, region: str = None):
         self.log_group = log_group or CLOUDWATCH_LOG_GROUP
         self.region = region or CLOUDWATCH_REGION
         self.sequence_token = None
         self._cloudwatch_initialized = False
+        self._queue: "queue.Queue[Optional[dict]]" = queue.Queue()  # None asks the worker to send now
+        self._worker: Optional[threading.Thread] = None
+        self._console_queue: "queue.Queue[logging.LogRecord]" = queue.Queue()
         
+        self._console_listener: Optional[logging.handlers.QueueListener] = None
         self._console = self._create_console_logger()
+        _instances.add(self)
         self._cloudwatch = None
         self.log_stream = None
 
@@ -32,26 +95,97 @@ class CloudWatchLogger:
     # Public logging methods
     # -------------------------------------------------------------------------
     
-    def info(self, message: str) -> None:
-        self._log("INFO", message)
+    # Messages may use %-style args, formatted only if the level is enabled:
+    # logger.info("Price: $%.2f", price)
+
+    def info(self, message: str, *args) -> None:
+        self._log(logging.INFO, message, args)
     
-    def warning(self, message: str) -> None:
-        self._log("WARNING", message)
+    def warning(self, message: str, *args) -> None:
+        self._log(logging.WARNING, message, args)
     
-    def error(self, message: str) -> None:
-        self._log("ERROR", message)
+    def error(self, message: str, *args) -> None:
+        self._log(logging.ERROR, message, args)
     
-    def debug(self, message: str) -> None:
-        self._log("DEBUG", message)
+    def debug(self, message: str, *args) -> None:
+        self._log(logging.DEBUG, message, args)
+
+    def exception(self, message: str, *args) -> None:
+        """Log an error with the traceback of the exception being handled."""
+        self._log(logging.ERROR, message, args, exc_info=True)
+
+    def flush(self) -> None:
+        """Block until all queued records are on the console and all queued events are in CloudWatch."""
+        self._console_queue.join()
+        if self._worker is None:
+            return
+        self._queue.put(None)
+        self._queue.join()
+
+    def close(self) -> None:
+        """Flush queued events, then stop the console listener; later records are not written."""
+        self.flush()
+        if self._console_listener is not None:
+            self._console_listener.stop()
+            self._console_listener = None
 
     # -------------------------------------------------------------------------
     # Private methods
     # -------------------------------------------------------------------------
 
-    def _log(self, level: str, message: str) -> None:
-        """Route message to console and CloudWatch."""
-        getattr(self._console, level.lower())(message)
-        self._send_to_cloudwatch(level, message)
+    def _drain_queue(self) -> None:
+        """Send queued events in batches, off the caller's thread."""
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.FLUSH_INTERVAL
+            while batch[-1] is not None and len(batch) < self.BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            try:
+                # Events are stamped on the logging threads, so they can be queued slightly out of order;
+                # PutLogEvents rejects a whole batch that isn't chronological
+                events = sorted((event for event in batch if event is not None), key=lambda event: event["timestamp"])
+                self._put_events(events)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _put_events(self, events: list[dict]) -> None:
+        """Send a batch of log events to CloudWatch."""
+        if not events:
+            return
+        
+        try:
+            params = {
+                "logGroupName": self.log_group,
+                "logStreamName": self.log_stream,
+                "logEvents": events
+            }
+            if self.sequence_token:
+                params["sequenceToken"] = self.sequence_token
+            
+            response = self._cloudwatch.put_log_events(**params)
+            self.sequence_token = response.get("nextSequenceToken")
+        except Exception as e:
+            # Console only: routing this through _log would queue it for the failing CloudWatch call
+            self._console.warning("Failed to send %d log events to CloudWatch: %s", len(events), e)
+
+    def _log(self, level: int, message: str, args: tuple = (), exc_info: bool = False) -> None:
+        """Route message to console and CloudWatch, skipping all work for filtered levels."""
+        if not self._console.isEnabledFor(level):
+            return
+        if args:
+            message = message % args
+        if exc_info:
+            message = f"{message}\n{traceback.format_exc().rstrip()}"
+        self._console.log(level, message)
+        self._send_to_cloudwatch(logging.getLevelName(level), message)
     
     def initialize_cloudwatch(self, account_id: str) -> None:
         """Initialize CloudWatch with account-specific log group."""
@@ -62,38 +196,33 @@ class CloudWatchLogger:
         self.log_group = f"{self.log_group}-{account_id.lower()}"
         self._cloudwatch, self.log_stream = self._create_cloudwatch_client()
         self._cloudwatch_initialized = True
+        if self._cloudwatch:
+            self._worker = threading.Thread(target=self._drain_queue, name="cloudwatch", daemon=True)
+            self._worker.start()
 
     def _send_to_cloudwatch(self, level: str, message: str) -> None:
-        """Send a single log event to CloudWatch."""
+        """Queue a log event for the background CloudWatch worker."""
         if not self._cloudwatch:
             return
         
-        try:
-            params = {
-                "logGroupName": self.log_group,
-                "logStreamName": self.log_stream,
-                "logEvents": [{
-                    "timestamp": int(datetime.now().timestamp() * 1000),
-                    "message": f"[{level}] {message}"
-                }]
-            }
-            if self.sequence_token:
-                params["sequenceToken"] = self.sequence_token
-            
-            response = self._cloudwatch.put_log_events(**params)
-            self.sequence_token = response.get("nextSequenceToken")
-        except Exception:
-            pass  # Silently fail - console logging is the fallback
+        self._queue.put({
+            "timestamp": time.time_ns() // 1_000_000,  # Epoch milliseconds from one integer clock read
+            "message": f"[{level}] {message}"
+        })
 
     def _create_console_logger(self) -> logging.Logger:
-        """Create a standard console logger."""
+        """Create a console logger whose stdout writes happen on a background listener thread."""
         logger = logging.getLogger("algo_trading")
         logger.setLevel(logging.INFO)
         logger.handlers.clear()
         
         handler = logging.StreamHandler(sys.stdout)
         handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
-        logger.addHandler(handler)
+        logger.addHandler(logging.handlers.QueueHandler(self._console_queue))
+        
+        # Callers only enqueue the record; the listener owns the stdout handler and its lock
+        self._console_listener = logging.handlers.QueueListener(self._console_queue, handler)
+        self._console_listener.start()
         
         return logger
 
@@ -105,10 +234,10 @@ class CloudWatchLogger:
             client = boto3.client("logs", region_name=self.region)
             self._ensure_log_group_exists(client)
             self._ensure_log_stream_exists(client, log_stream)
-            self._console.info(f"CloudWatch initialized: {self.log_group}/{log_stream}")
+            self._console.info("CloudWatch initialized: %s/%s", self.log_group, log_stream)
             return client, log_stream
         except (NoCredentialsError, ClientError, Exception) as e:
-            self._console.warning(f"CloudWatch unavailable: {e}. Using console only.")
+            self._console.warning("CloudWatch unavailable: %s. Using console only.", e)
             return None, log_stream
 
     def _ensure_log_group_exists(self, client) -> None:
@@ -129,20 +258,10 @@ class CloudWatchLogger:
 
     def _generate_log_stream_name(self) -> str:
         """Generate unique log stream name from instance ID and timestamp."""
-        instance_id = self._get_instance_id()
+        instance_id = _get_instance_id()
         timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
         return f"{instance_id}-{timestamp}"
 
-    def _get_instance_id(self) -> str:
-        """Get EC2 instance ID, falling back to hostname if not on EC2."""
-        try:
-            import urllib.request
-            with urllib.request.urlopen(EC2_METADATA_URL, timeout=2) as response:
-                metadata = json.loads(response.read().decode())
-                return metadata.get("instanceId", socket.gethostname())
-        except Exception:
-            return socket.gethostname()
-
 
 # -----------------------------------------------------------------------------
 # Module-level singleton
@@ -1,78 +1,117 @@
 """Trade logging functionality for Excel reporting with S3 storage."""
 
+import atexit
+import csv
 import io
-from datetime import datetime
+import threading
+import weakref
 from typing import Optional
 
-import boto3
 import pandas as pd
 from botocore.exceptions import ClientError
 
 from algo_trader.logging.cloudwatch_logger import get_logger
 from algo_trader.models import Trade
 from algo_trader.notifications import NotificationService
+from algo_trader.utils.aws import get_client, is_bucket_verified, mark_bucket_verified
 from algo_trader.utils.config import S3_BUCKET_NAME, S3_REGION, S3_KEY_PREFIX
+from algo_trader.utils.excel import read_excel, write_excel
+
+# Live loggers, tracked weakly so registering for the exit flush doesn't keep them alive
+_instances: "weakref.WeakSet[TradeLogger]" = weakref.WeakSet()
+
+
+def _flush_at_exit() -> None:
+    """Upload every live logger's pending trades, then drain the notifications those uploads queued."""
+    for trade_logger in list(_instances):
+        trade_logger.flush()
+    NotificationService.flush()
+
+
+# One handler doing both steps in order; a per-instance handler could run after the notification worker's
+atexit.register(_flush_at_exit)
 
 
 class TradeLogger:
-    """Logs trade information to Excel files stored in S3."""
+    """Logs trade information to a CSV history in S3, exported to Excel on demand."""
     
-    FILENAME_TEMPLATE = "{account_id}-order-history.xlsx"
-    EXCEL_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    FILENAME_TEMPLATE = "{account_id}-order-history.csv"
+    LEGACY_FILENAME_TEMPLATE = "{account_id}-order-history.xlsx"
+    CSV_CONTENT_TYPE = "text/csv"
+    BATCH_SIZE = 10       # Pending trades that trigger an immediate upload
+    FLUSH_INTERVAL = 5.0  # Seconds a pending trade waits to share an upload with later ones
     
     def __init__(self):
         self.logger = get_logger()
         self.notifications = NotificationService()
-        self.s3 = boto3.client("s3", region_name=S3_REGION)
+        self.s3 = get_client("s3", S3_REGION)
         self.bucket_name = S3_BUCKET_NAME
         self._bucket_initialized = False
+        self._history: dict[str, str] = {}  # account_id -> CSV history as last uploaded
+        self._pending: list[Trade] = []
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # One upload at a time, whether from the timer or a caller
+        self._flush_timer: Optional[threading.Timer] = None
+        _instances.add(self)
 
     # -------------------------------------------------------------------------
     # Public methods
     # -------------------------------------------------------------------------
 
     def log_trade(self, trade: Trade) -> str:
-        """Log trade to S3 and send notifications. Returns order ID."""
+        """Queue trade for a batched S3 upload and notification. Returns order ID."""
         # Initialize bucket with account ID on first trade
         self._initialize_bucket(trade.account_id)
 
-        # Ensure trade has an order ID
-        if trade.order_id is None:
-            trade.order_id = f"ORD_{trade.timestamp.strftime('%Y%m%d_%H%M%S')}"
-        
-        try:
-            s3_key = self._get_s3_key(trade.account_id)
-            existing_df = self._download_excel(s3_key)
-            updated_df = pd.concat([existing_df, pd.DataFrame([trade.to_dict()])], ignore_index=True)
-            self._upload_excel(updated_df, s3_key)
+        with self._pending_lock:
+            self._pending.append(trade)
+            batch_full = len(self._pending) >= self.BATCH_SIZE
+            if not batch_full and self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.FLUSH_INTERVAL, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
 
-            self.logger.info(f"Trade logged to s3://{self.bucket_name}/{s3_key}")
-            self.notifications.send_trade_notification(trade)
-        except Exception as e:
-            self.logger.error(f"Failed to log trade: {e}")
-        
+        if batch_full:
+            self.flush()
         return trade.order_id
 
+    def flush(self) -> None:
+        """Upload pending trades with one PUT per account, then send their notifications."""
+        with self._flush_lock:
+            with self._pending_lock:
+                trades, self._pending = self._pending, []
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+
+            trades_by_account: dict[str, list[Trade]] = {}
+            for trade in trades:
+                trades_by_account.setdefault(trade.account_id, []).append(trade)
+            for account_id, account_trades in trades_by_account.items():
+                self._write_trades(account_id, account_trades)
+
     def get_trade_history(self, account_id: str) -> Optional[pd.DataFrame]:
         """Retrieve trade history DataFrame for an account."""
         self._initialize_bucket(account_id)
+        self.flush()
         try:
-            df = self._download_excel(self._get_s3_key(account_id))
+            df = pd.read_csv(io.StringIO(self._get_history(account_id)))
             return df if not df.empty else None
         except Exception as e:
-            self.logger.error(f"Failed to get trade history: {e}")
+            self.logger.error("Failed to get trade history: %s", e)
             return None
 
     def download_to_file(self, account_id: str, local_path: str) -> bool:
-        """Download trade history Excel file to local path."""
+        """Export trade history as an Excel file at local path."""
         self._initialize_bucket(account_id)
+        self.flush()
         try:
-            self.s3.download_file(self.bucket_name, self._get_s3_key(account_id), local_path)
-            self.logger.info(f"Downloaded trade history to {local_path}")
+            df = pd.read_csv(io.StringIO(self._get_history(account_id)))
+            write_excel(df, local_path, sheet_name="Trades")
+            self.logger.info("Exported trade history to %s", local_path)
             return True
-        except ClientError as e:
-            error_code = e.response["Error"]["Code"]
-            self.logger.error(f"S3 download failed ({error_code}): {e}")
+        except Exception as e:
+            self.logger.error("Failed to export trade history: %s", e)
             return False
 
     # -------------------------------------------------------------------------
@@ -95,13 +134,17 @@ class TradeLogger:
 
     def _ensure_bucket_exists(self) -> None:
         """Create S3 bucket if it doesn't exist."""
+        if is_bucket_verified(self.bucket_name):
+            return
+
         try:
             self.s3.head_bucket(Bucket=self.bucket_name)
+            mark_bucket_verified(self.bucket_name)
         except ClientError as e:
             if e.response["Error"]["Code"] == "404":
                 self._create_bucket()
             else:
-                self.logger.error(f"Error checking bucket: {e}")
+                self.logger.error("Error checking bucket: %s", e)
 
     def _create_bucket(self) -> None:
         """Create S3 bucket with appropriate configuration."""
@@ -114,29 +157,72 @@ class TradeLogger:
                     Bucket=self.bucket_name,
                     CreateBucketConfiguration={"LocationConstraint": S3_REGION}
                 )
-            self.logger.info(f"Created S3 bucket: {self.bucket_name}")
+            self.logger.info("Created S3 bucket: %s", self.bucket_name)
+            mark_bucket_verified(self.bucket_name)
         except ClientError as e:
-            self.logger.error(f"Failed to create bucket: {e}")
+            self.logger.error("Failed to create bucket: %s", e)
+
+    def _get_legacy_s3_key(self, account_id: str) -> str:
+        """Generate S3 key for account's pre-CSV Excel trade history file."""
+        return f"{S3_KEY_PREFIX}{self.LEGACY_FILENAME_TEMPLATE.format(account_id=account_id)}"
+
+    def _write_trades(self, account_id: str, trades: list[Trade]) -> None:
+        """Append trades to the account's CSV history and upload it once."""
+        try:
+            s3_key = self._get_s3_key(account_id)
+            history = self._get_history(account_id) + "".join(self._format_csv_row(trade) for trade in trades)
+            self._upload_csv(history, s3_key)
+            self._history[account_id] = history
+
+            self.logger.info("Logged %d trade(s) to s3://%s/%s", len(trades), self.bucket_name, s3_key)
+            for trade in trades:
+                self.notifications.send_trade_notification(trade)
+        except Exception as e:
+            self.logger.error("Failed to log trade: %s", e)
+
+    def _format_csv_row(self, trade: Trade) -> str:
+        """Serialize a single trade as a CSV line."""
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerow(trade.to_dict().values())
+        return buffer.getvalue()
+
+    def _get_history(self, account_id: str) -> str:
+        """Get CSV history for an account, downloading it from S3 only on first use."""
+        if account_id not in self._history:
+            self._history[account_id] = self._download_csv(account_id)
+        return self._history[account_id]
+
+    def _download_csv(self, account_id: str) -> str:
+        """Download CSV history from S3, seeding it from the legacy Excel file if not found."""
+        try:
+            response = self.s3.get_object(Bucket=self.bucket_name, Key=self._get_s3_key(account_id))
+            return response["Body"].read().decode("utf-8")
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "NoSuchKey":
+                raise
+
+        legacy_df = self._download_excel(self._get_legacy_s3_key(account_id))
+        if legacy_df.empty:
+            legacy_df = pd.DataFrame(columns=list(Trade.COLUMNS))
+        else:
+            self.logger.info("Migrating %d trades from legacy Excel history", len(legacy_df))
+        return legacy_df.to_csv(index=False, lineterminator="\n")
 
     def _download_excel(self, s3_key: str) -> pd.DataFrame:
         """Download Excel file from S3, returns empty DataFrame if not found."""
         try:
             response = self.s3.get_object(Bucket=self.bucket_name, Key=s3_key)
-            return pd.read_excel(io.BytesIO(response["Body"].read()))
+            return read_excel(io.BytesIO(response["Body"].read()))
         except ClientError as e:
             if e.response["Error"]["Code"] == "NoSuchKey":
                 return pd.DataFrame()
             raise
 
-    def _upload_excel(self, df: pd.DataFrame, s3_key: str) -> None:
-        """Upload DataFrame as Excel file to S3."""
-        buffer = io.BytesIO()
-        df.to_excel(buffer, index=False, engine="openpyxl")
-        buffer.seek(0)
-        
+    def _upload_csv(self, content: str, s3_key: str) -> None:
+        """Upload CSV history to S3."""
         self.s3.put_object(
             Bucket=self.bucket_name,
             Key=s3_key,
-            Body=buffer.getvalue(),
-            ContentType=self.EXCEL_CONTENT_TYPE
-        )
\ No newline at end of file
+            Body=content.encode("utf-8"),
+            ContentType=self.CSV_CONTENT_TYPE
+        )
@@ -1,14 +1,17 @@
 """Trade data model."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import ClassVar, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Trade:
     """Represents a trading transaction."""
     
+    # Column order of to_dict(), shared by every export of trade records
+    COLUMNS: ClassVar[tuple[str, ...]] = ("Date", "OrderId", "Action", "Symbol", "Dollar Amount", "Shares")
+    
     account_id: str
     action: str  # "Buy" or "Sell"
     symbol: str
@@ -16,27 +19,23 @@ class Trade:
     shares: float
     order_id: Optional[str] = None
     timestamp: Optional[datetime] = None
+    formatted_timestamp: str = field(init=False, repr=False, compare=False)  # Set once in __post_init__
     
     def __post_init__(self):
-        """Set timestamp if not provided."""
+        """Set timestamp and fallback order ID if not provided."""
         if self.timestamp is None:
             self.timestamp = datetime.now()
         
+        # Formatted once here; to_dict and the trade notification both read it
+        self.formatted_timestamp = self.timestamp.strftime("%Y-%m-%d %H:%M:%S")
+        
+        if self.order_id is None:
+            self.order_id = f"ORD_{self.timestamp.strftime('%Y%m%d_%H%M%S')}"
+        
         # Round shares to 2 decimal places
         self.shares = round(self.shares, 2)
     
-    @property
-    def formatted_timestamp(self) -> str:
-        """Get formatted timestamp string."""
-        return self.timestamp.strftime("%Y-%m-%d %H:%M:%S")
-    
     def to_dict(self) -> dict:
         """Convert trade to dictionary for Excel/logging."""
-        return {
-            "Date": self.formatted_timestamp,
-            "OrderId": self.order_id or f"ORD_{self.timestamp.strftime('%Y%m%d_%H%M%S')}",
-            "Action": self.action,
-            "Symbol": self.symbol,
-            "Dollar Amount": self.dollar_amount,
-            "Shares": self.shares
-        }
\ No newline at end of file
+        values = (self.formatted_timestamp, self.order_id, self.action, self.symbol, self.dollar_amount, self.shares)
+        return dict(zip(self.COLUMNS, values, strict=True))
\ No newline at end of file
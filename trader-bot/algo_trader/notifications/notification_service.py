@@ -1,14 +1,20 @@
 """Notification service for trade alerts via email and Telegram."""
 
+import atexit
 import json
 import os
+import queue
+import threading
+import time
 from datetime import datetime
+from functools import lru_cache
 from zoneinfo import ZoneInfo
 from typing import Optional
 
 import boto3
 import requests
 from botocore.exceptions import ClientError
+from requests.adapters import HTTPAdapter
 
 from algo_trader.models import Trade, Severity
 from algo_trader.logging import get_logger
@@ -16,67 +22,104 @@ from algo_trader.utils.config import (
     EMAIL_FROM, EMAIL_TO, EMAIL_REGION,
     TELEGRAM_CHAT_ID, SECRETS_MANAGER_SECRET_NAME, SECRETS_MANAGER_REGION
 )
+from algo_trader.utils.aws import get_client
+
+
+@lru_cache(maxsize=1)
+def _get_telegram_token() -> Optional[str]:
+    """Fetch Telegram bot token once per process, from the environment or AWS Secrets Manager."""
+    env_token = os.getenv("TELEGRAM_BOT_TOKEN")
+    if env_token:
+        return env_token
+
+    logger = get_logger()
+    try:
+        # Create a Secrets Manager client
+        secrets_client = get_client("secretsmanager", SECRETS_MANAGER_REGION)
+        
+        # Retrieve the secret
+        response = secrets_client.get_secret_value(SecretId=SECRETS_MANAGER_SECRET_NAME)
+        
+        # Parse the secret JSON
+        secret_data = json.loads(response["SecretString"])
+        
+        # Extract the Telegram bot token
+        telegram_token = secret_data.get("TelegramBotToken")
+        
+        if telegram_token:
+            logger.info("Successfully retrieved Telegram bot token from Secrets Manager")
+            return telegram_token
+        else:
+            logger.error("TelegramBotToken key not found in secret")
+            return None
+            
+    except ClientError as e:
+        error_code = e.response["Error"]["Code"]
+        if error_code == "ResourceNotFoundException":
+            logger.error("Secret '%s' not found in Secrets Manager", SECRETS_MANAGER_SECRET_NAME)
+        elif error_code == "InvalidRequestException":
+            logger.error("Invalid request to Secrets Manager")
+        elif error_code == "InvalidParameterException":
+            logger.error("Invalid parameter for Secrets Manager request")
+        elif error_code == "DecryptionFailureException":
+            logger.error("Failed to decrypt secret from Secrets Manager")
+        elif error_code == "InternalServiceErrorException":
+            logger.error("Internal error in Secrets Manager service")
+        else:
+            logger.error("Secrets Manager error: %s", e)
+        return None
+    except json.JSONDecodeError as e:
+        logger.error("Failed to parse secret JSON: %s", e)
+        return None
+    except Exception as e:
+        logger.error("Unexpected error retrieving Telegram token: %s", e)
+        return None
+
+
+def _create_telegram_session() -> requests.Session:
+    """Create a pooled session so Telegram calls reuse one TLS connection."""
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+    return session
+
 
 class NotificationService:
     """Handles sending trade notifications via email and Telegram."""
     
+    _SESSION = _create_telegram_session()
+    
+    # Background delivery of trade notifications, shared by all instances
+    _queue: "queue.Queue[tuple[NotificationService, str, str]]" = queue.Queue()
+    _worker: Optional[threading.Thread] = None
+    _worker_lock = threading.Lock()
+    BATCH_WINDOW = 0.1  # Seconds to wait for more queued trades before emailing
+    
     def __init__(self):
         self.logger = get_logger()
         self.ses_client = self._setup_ses_client()
-        self.telegram_token = self._get_telegram_token()
+        self.telegram_token = _get_telegram_token()
         self.telegram_chat_id = os.getenv("TELEGRAM_CHAT_ID", TELEGRAM_CHAT_ID)
+        self._telegram_api_url = self._build_telegram_api_url()
     
     def _setup_ses_client(self) -> Optional[boto3.client]:
         """Initialize AWS SES client."""
         try:
-            return boto3.client("ses", region_name=EMAIL_REGION)
+            return get_client("ses", EMAIL_REGION)
         except Exception as e:
-            self.logger.warning(f"SES client initialization failed: {e}")
+            self.logger.warning("SES client initialization failed: %s", e)
             return None
     
-    def _get_telegram_token(self) -> Optional[str]:
-        """Fetch Telegram bot token from AWS Secrets Manager."""
-        try:
-            # Create a Secrets Manager client
-            secrets_client = boto3.client("secretsmanager", region_name=SECRETS_MANAGER_REGION)
-            
-            # Retrieve the secret
-            response = secrets_client.get_secret_value(SecretId=SECRETS_MANAGER_SECRET_NAME)
-            
-            # Parse the secret JSON
-            secret_data = json.loads(response["SecretString"])
-            
-            # Extract the Telegram bot token
-            telegram_token = secret_data.get("TelegramBotToken")
-            
-            if telegram_token:
-                self.logger.info("Successfully retrieved Telegram bot token from Secrets Manager")
-                return telegram_token
-            else:
-                self.logger.error("TelegramBotToken key not found in secret")
-                return None
-                
-        except ClientError as e:
-            error_code = e.response["Error"]["Code"]
-            if error_code == "ResourceNotFoundException":
-                self.logger.error(f"Secret '{SECRETS_MANAGER_SECRET_NAME}' not found in Secrets Manager")
-            elif error_code == "InvalidRequestException":
-                self.logger.error("Invalid request to Secrets Manager")
-            elif error_code == "InvalidParameterException":
-                self.logger.error("Invalid parameter for Secrets Manager request")
-            elif error_code == "DecryptionFailureException":
-                self.logger.error("Failed to decrypt secret from Secrets Manager")
-            elif error_code == "InternalServiceErrorException":
-                self.logger.error("Internal error in Secrets Manager service")
-            else:
-                self.logger.error(f"Secrets Manager error: {e}")
+    def _build_telegram_api_url(self) -> Optional[str]:
+        """Validate the bot token once and build the Telegram API base URL."""
+        if not self.telegram_token:
             return None
-        except json.JSONDecodeError as e:
-            self.logger.error(f"Failed to parse secret JSON: {e}")
-            return None
-        except Exception as e:
-            self.logger.error(f"Unexpected error retrieving Telegram token: {e}")
+        
+        # Validate token format (should start with a number followed by colon)
+        if ":" not in self.telegram_token:
+            self.logger.error("Invalid Telegram bot token format. Should be like: 123456789:ABC-DEF...")
             return None
+        
+        return f"https://api.telegram.org/bot{self.telegram_token}"
     
     def send_notification(self, account_id: str, severity: Severity, message: str) -> None:
         """Send notification via email and Telegram."""
@@ -94,15 +137,59 @@ class NotificationService:
         self._send_telegram(message)
 
     def send_trade_notification(self, trade: Trade) -> None:
-        """Send trade notification via email and Telegram."""
+        """Queue trade notification for background delivery via email and Telegram."""
         message = self._format_trade_message(trade)
-        
-        # Send email notification
-        self._send_email(f"Trade Executed: {trade.action} {trade.symbol}", message)
-        
-        # Send Telegram notification
-        self._send_telegram(message)
-    
+        self._ensure_worker()
+        self._queue.put((self, f"Trade Executed: {trade.action} {trade.symbol}", message))
+
+    @classmethod
+    def flush(cls) -> None:
+        """Block until all queued notifications have been sent."""
+        cls._queue.join()
+
+    @classmethod
+    def _ensure_worker(cls) -> None:
+        """Start the background notification worker on first use."""
+        with cls._worker_lock:
+            if cls._worker is not None:
+                return
+            cls._worker = threading.Thread(target=cls._drain_queue, name="notifications", daemon=True)
+            cls._worker.start()
+            atexit.register(cls.flush)
+
+    @classmethod
+    def _drain_queue(cls) -> None:
+        """Send queued notifications, coalescing bursts into a single email."""
+        while True:
+            batch = [cls._queue.get()]
+            deadline = time.monotonic() + cls.BATCH_WINDOW
+            while (remaining := deadline - time.monotonic()) > 0:
+                try:
+                    batch.append(cls._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                cls._send_batch(batch)
+            except Exception as e:
+                # Never let the worker die, or queued trades are lost and flush() blocks forever
+                get_logger().error(f"Failed to send queued notifications: {e}")
+            finally:
+                for _ in batch:
+                    cls._queue.task_done()
+
+    @staticmethod
+    def _send_batch(batch: "list[tuple[NotificationService, str, str]]") -> None:
+        """Send one email for the whole batch and a Telegram message per trade."""
+        service, subject, message = batch[0]
+        if len(batch) == 1:
+            service._send_email(subject, message)
+        else:
+            service._send_email(f"{len(batch)} Trades Executed", "\n\n".join(m for _, _, m in batch))
+
+        for service, _, message in batch:
+            service._send_telegram(message)
+
     def _format_trade_message(self, trade: Trade) -> str:
         """Format trade information into a readable message."""
         return f"""🤖 Trade Executed
@@ -132,69 +219,58 @@ class NotificationService:
                     }
                 }
             )
-            self.logger.info(f"Email notification sent: {response['MessageId']}")
+            self.logger.info("Email notification sent: %s", response['MessageId'])
         except ClientError as e:
-            self.logger.error(f"Failed to send email: {e}")
+            self.logger.error("Failed to send email: %s", e)
         except Exception as e:
-            self.logger.error(f"Unexpected email error: {e}")
+            self.logger.error("Unexpected email error: %s", e)
     
     def _send_telegram(self, message: str) -> None:
         """Send Telegram notification."""
-        if not self.telegram_token or not self.telegram_chat_id:
+        if not self._telegram_api_url or not self.telegram_chat_id:
             self.logger.debug("Telegram notification skipped - not configured")
             return
         
-        # Validate token format (should start with a number followed by colon)
-        if ":" not in self.telegram_token:
-            self.logger.error("Invalid Telegram bot token format. Should be like: 123456789:ABC-DEF...")
-            return
-        
         try:
-            url = f"https://api.telegram.org/bot{self.telegram_token}/sendMessage"
+            url = f"{self._telegram_api_url}/sendMessage"
+            # Plain text: messages carry free-form error text that isn't HTML-escaped
             payload = {
                 "chat_id": self.telegram_chat_id,
-                "text": message,
-                "parse_mode": "HTML"
+                "text": message
             }
             
-            self.logger.debug(f"Sending Telegram message to chat_id: {self.telegram_chat_id}")
-            response = requests.post(url, json=payload, timeout=10)
+            self.logger.debug("Sending Telegram message to chat_id: %s", self.telegram_chat_id)
+            response = self._SESSION.post(url, json=payload, timeout=10)
             
-            if response.status_code != 200:
-                error_detail = response.text
-                self.logger.error(f"Telegram API error ({response.status_code}): {error_detail}")
-                
-                # Common error explanations
-                if "chat not found" in error_detail.lower():
-                    self.logger.error("Chat ID not found. Make sure you've started a conversation with the bot first.")
-                elif "unauthorized" in error_detail.lower():
-                    self.logger.error("Bot token is invalid or bot was blocked.")
-                elif "bad request" in error_detail.lower():
-                    self.logger.error("Bad request - check your bot token and chat ID format.")
-                
+            if response.status_code == 200:
+                self.logger.info("Telegram notification sent successfully")
                 return
             
-            response.raise_for_status()
-            self.logger.info("Telegram notification sent successfully")
+            error_detail = self._read_error_detail(response)
+            self.logger.error("Telegram API error (%s): %s", response.status_code, error_detail)
+            
+            # Common error explanations
+            error_detail = error_detail.lower()
+            if "chat not found" in error_detail:
+                self.logger.error("Chat ID not found. Make sure you've started a conversation with the bot first.")
+            elif "unauthorized" in error_detail:
+                self.logger.error("Bot token is invalid or bot was blocked.")
+            elif "bad request" in error_detail:
+                self.logger.error("Bad request - check your bot token and chat ID format.")
             
         except requests.RequestException as e:
-            self.logger.error(f"Failed to send Telegram message: {e}")
+            self.logger.error("Failed to send Telegram message: %s", e)
         except Exception as e:
-            self.logger.error(f"Unexpected Telegram error: {e}")
+            self.logger.error("Unexpected Telegram error: %s", e)
     
     def send_telegram_image(self, image_path: str, caption: str = "") -> None:
         """Send image via Telegram."""
-        if not self.telegram_token or not self.telegram_chat_id:
+        if not self._telegram_api_url or not self.telegram_chat_id:
             self.logger.debug("Telegram image notification skipped - not configured")
             return
         
-        # Validate token format
-        if ":" not in self.telegram_token:
-            self.logger.error("Invalid Telegram bot token format. Should be like: 123456789:ABC-DEF...")
-            return
-        
         try:
-            url = f"https://api.telegram.org/bot{self.telegram_token}/sendPhoto"
+            url = f"{self._telegram_api_url}/sendPhoto"
             
             with open(image_path, 'rb') as image_file:
                 files = {'photo': image_file}
@@ -204,20 +280,24 @@ class NotificationService:
                     'parse_mode': 'HTML'
                 }
                 
-                self.logger.debug(f"Sending Telegram image to chat_id: {self.telegram_chat_id}")
-                response = requests.post(url, files=files, data=data, timeout=30)
+                self.logger.debug("Sending Telegram image to chat_id: %s", self.telegram_chat_id)
+                response = self._SESSION.post(url, files=files, data=data, timeout=30)
                 
-                if response.status_code != 200:
-                    error_detail = response.text
-                    self.logger.error(f"Telegram API error ({response.status_code}): {error_detail}")
+                if response.status_code == 200:
+                    self.logger.info("Telegram image sent successfully")
                     return
                 
-                response.raise_for_status()
-                self.logger.info("Telegram image sent successfully")
+                error_detail = self._read_error_detail(response)
+                self.logger.error("Telegram API error (%s): %s", response.status_code, error_detail)
                 
         except FileNotFoundError:
-            self.logger.error(f"Image file not found: {image_path}")
+            self.logger.error("Image file not found: %s", image_path)
         except requests.RequestException as e:
-            self.logger.error(f"Failed to send Telegram image: {e}")
+            self.logger.error("Failed to send Telegram image: %s", e)
         except Exception as e:
-            self.logger.error(f"Unexpected Telegram image error: {e}")
\ No newline at end of file
+            self.logger.error("Unexpected Telegram image error: %s", e)
+
+    @staticmethod
+    def _read_error_detail(response: requests.Response, limit: int = 512) -> str:
+        """Decode at most `limit` bytes of an error response body."""
+        return response.content[:limit].decode("utf-8", errors="replace")
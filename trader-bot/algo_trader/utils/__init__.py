@@ -2,6 +2,7 @@
 
 from algo_trader.utils.config import *
 from algo_trader.utils.decorators import retry
+from algo_trader.utils.concurrency import run_concurrently
 from algo_trader.models import Signal
 
-__all__ = ["retry", "Signal"]
+__all__ = ["retry", "run_concurrently", "Signal"]
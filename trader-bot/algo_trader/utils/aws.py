@@ -0,0 +1,33 @@
+"""Shared AWS client helpers."""
+
+from functools import lru_cache
+
+import boto3
+from botocore.config import Config
+
+# One pooled, keep-alive connection set per client, with botocore's standard retry mode
+CLIENT_CONFIG = Config(
+    max_pool_connections=20,
+    retries={"max_attempts": 3, "mode": "standard"},
+    tcp_keepalive=True,
+)
+
+
+@lru_cache(maxsize=None)
+def get_client(service_name: str, region_name: str):
+    """Get or create a boto3 client shared across the process (boto3 clients are thread-safe)."""
+    return boto3.client(service_name, region_name=region_name, config=CLIENT_CONFIG)
+
+
+# Buckets confirmed to exist in this process, so each account's bucket is checked once however many S3 users touch it
+_verified_buckets: set[str] = set()
+
+
+def is_bucket_verified(bucket_name: str) -> bool:
+    """Whether this process has already confirmed the bucket exists."""
+    return bucket_name in _verified_buckets
+
+
+def mark_bucket_verified(bucket_name: str) -> None:
+    """Record that the bucket exists (found by head_bucket or just created)."""
+    _verified_buckets.add(bucket_name)
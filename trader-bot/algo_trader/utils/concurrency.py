@@ -0,0 +1,17 @@
+"""Helpers for overlapping independent blocking calls."""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+
+def run_concurrently(*calls: Callable) -> list:
+    """Run independent zero-argument calls on a thread pool and return their results in order.
+
+    The first exception raised by any call propagates once all calls have finished.
+    """
+    if len(calls) <= 1:
+        return [call() for call in calls]
+
+    with ThreadPoolExecutor(max_workers=len(calls)) as executor:
+        futures = [executor.submit(call) for call in calls]
+    return [future.result() for future in futures]
@@ -3,6 +3,10 @@
 # IBKR Web API Configuration
 BASE_URL = "https://127.0.0.1:5000/v1/api"
 VERIFY_SSL = False  # self-signed cert
+PRICE_CACHE_TTL = 5  # Seconds a fetched price is reused
+POSITIONS_CACHE_TTL = 2  # Seconds fetched positions are reused
+SUMMARY_CACHE_TTL = 30  # Seconds a fetched account summary (cash, balance) is reused
+IBKR_MAX_CONCURRENCY = 5  # Gateway requests allowed in flight at once
 
 # Trading Configuration
 SYMBOL = "TQQQ"
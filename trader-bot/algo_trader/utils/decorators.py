@@ -1,39 +1,45 @@
 """Utility decorators."""
 
 import functools
+import random
 import time
 
 
-def retry(max_attempts=3, delay=2, backoff=2, no_retry_exceptions=None):
+def retry(max_attempts=3, delay=2, backoff=2, no_retry_exceptions=None, retry_on=(Exception,), max_delay=30):
     """Retry decorator for handling transient failures.
-    
+
     Args:
         max_attempts: Maximum number of retry attempts
         delay: Initial delay between retries in seconds
         backoff: Multiplier for delay after each retry
         no_retry_exceptions: List of exception types that should not be retried
+        retry_on: Tuple of exception types that are retried; anything else is raised immediately
+        max_delay: Upper bound in seconds for any single wait between retries
     """
-    if no_retry_exceptions is None:
-        no_retry_exceptions = []
-    
+    no_retry_exceptions = tuple(no_retry_exceptions or ())
+    # Capped backoff ceiling before each retry, computed once instead of per failure
+    sleep_schedule = [min(max_delay, delay * backoff ** attempt) for attempt in range(max_attempts - 1)] + [0]
+
     def decorator(func):
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            attempts = 0
-            wait = delay
-            while attempts < max_attempts:
+            start = time.monotonic()
+            last_error = None
+            for attempt, wait in enumerate(sleep_schedule, start=1):
                 try:
                     return func(*args, **kwargs)
-                except Exception as e:
-                    # Check if this exception type should not be retried
-                    if any(isinstance(e, exc_type) for exc_type in no_retry_exceptions):
-                        raise  # Re-raise immediately without retry
-                    
-                    attempts += 1
-                    print(f"{func.__name__} failed: {e}. Retry {attempts}/{max_attempts}")
-                    if attempts < max_attempts:
-                        time.sleep(wait)
-                        wait *= backoff
-            raise Exception(f"{func.__name__} failed after {max_attempts} retries")
+                except no_retry_exceptions:
+                    raise  # Re-raise immediately without retry
+                except retry_on as e:
+                    last_error = e
+                    # Imported only on failure: algo_trader.logging imports utils at module load
+                    from algo_trader.logging import get_logger
+                    get_logger().warning("%s failed: %s. Retry %d/%d", func.__name__, e, attempt, max_attempts)
+                    if wait:
+                        # Full jitter so concurrent callers don't retry in lockstep
+                        time.sleep(random.uniform(0, wait))
+            elapsed = time.monotonic() - start
+            # Chain the final failure so its type and traceback survive the summary error
+            raise Exception(f"{func.__name__} failed after {max_attempts} retries ({elapsed:.1f}s)") from last_error
         return wrapper
     return decorator
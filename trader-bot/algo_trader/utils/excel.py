@@ -0,0 +1,37 @@
+"""Excel export helpers."""
+
+from typing import IO, Union
+
+import openpyxl
+import pandas as pd
+
+from algo_trader.logging.cloudwatch_logger import get_logger
+
+# calamine parses .xlsx in Rust; fall back to openpyxl when it isn't installed
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_READ_ENGINE = "calamine"
+except ImportError:
+    EXCEL_READ_ENGINE = "openpyxl"
+
+
+def read_excel(source: Union[str, IO[bytes]]) -> pd.DataFrame:
+    """Read the first sheet of an .xlsx path or buffer into a DataFrame."""
+    return pd.read_excel(source, engine=EXCEL_READ_ENGINE)
+
+
+def write_excel(df: pd.DataFrame, target: Union[str, IO[bytes]], sheet_name: str = "Sheet1") -> None:
+    """Write a DataFrame to an .xlsx path or buffer using openpyxl's streaming write-only mode."""
+    if not openpyxl.LXML:
+        get_logger().warning("lxml not installed - Excel export uses the slower pure-Python XML writer")
+
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet(sheet_name)
+    sheet.append(list(df.columns))
+
+    # Blank cells for missing values, matching DataFrame.to_excel
+    rows = df.astype(object).where(df.notna(), None)
+    for row in rows.itertuples(index=False, name=None):
+        sheet.append(row)
+
+    workbook.save(target)
@@ -0,0 +1,42 @@
+"""Tests for IBKRClient order confirmation."""
+
+import unittest
+from unittest import mock
+
+import requests
+
+from algo_trader.clients import IBKRClient, OrderConfirmationError, OrderRejectionError
+
+
+def _response(body) -> mock.Mock:
+    response = mock.Mock()
+    response.json.return_value = body
+    return response
+
+
+class ConfirmOrderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.session = mock.Mock(spec=requests.Session)
+        self.client = IBKRClient(session=self.session)
+
+    def test_error_after_resent_reply_is_unconfirmed(self):
+        self.session.post.side_effect = [requests.ReadTimeout("read timed out"), _response({"error": "Order not found"})]
+
+        with self.assertRaises(OrderConfirmationError) as ctx:
+            self.client._confirm_order("reply-1")
+
+        self.assertIn("check order status in IBKR", str(ctx.exception))
+        self.assertEqual(self.session.post.call_count, 2)
+
+    def test_error_on_first_reply_is_rejection(self):
+        self.session.post.return_value = _response({"error": "Insufficient funds"})
+
+        with self.assertRaises(OrderRejectionError) as ctx:
+            self.client._confirm_order("reply-1")
+
+        self.assertNotIsInstance(ctx.exception, OrderConfirmationError)
+
+
+if __name__ == "__main__":
+    unittest.main()
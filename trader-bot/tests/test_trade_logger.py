@@ -0,0 +1,133 @@
+"""Tests for TradeLogger."""
+
+import io
+import os
+import subprocess
+import sys
+import textwrap
+import time
+import unittest
+from unittest import mock
+
+import pandas as pd
+from botocore.exceptions import ClientError
+
+from algo_trader.logging import trade_logger
+from algo_trader.logging.trade_logger import TradeLogger
+from algo_trader.models import Trade
+from algo_trader.utils.excel import write_excel
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _no_such_key() -> ClientError:
+    return ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject")
+
+
+def _trade(order_id: str) -> Trade:
+    return Trade(account_id="U1", action="Buy", symbol="TQQQ", dollar_amount=100.0, shares=2.0, order_id=order_id)
+
+
+class TradeLoggerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.s3 = mock.MagicMock()
+        self.s3.get_object.side_effect = _no_such_key()
+        patches = [
+            mock.patch.object(trade_logger, "get_client", return_value=self.s3),
+            mock.patch.object(trade_logger, "NotificationService"),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.trade_logger = TradeLogger()
+        self.addCleanup(self.trade_logger.flush)
+
+    def uploaded_csv(self) -> str:
+        """Body of the last CSV history upload."""
+        return self.s3.put_object.call_args.kwargs["Body"].decode("utf-8")
+
+
+class LegacyMigrationTest(TradeLoggerTestCase):
+
+    def test_legacy_excel_history_seeds_missing_csv(self):
+        legacy = pd.DataFrame([["2025-01-02 10:00:00", "OLD1", "Sell", "TQQQ", 50.0, 1.0]], columns=list(Trade.COLUMNS))
+        workbook = io.BytesIO()
+        write_excel(legacy, workbook)
+        csv_key = self.trade_logger._get_s3_key("U1")
+        legacy_key = self.trade_logger._get_legacy_s3_key("U1")
+
+        def get_object(Bucket, Key):
+            if Key == legacy_key:
+                return {"Body": io.BytesIO(workbook.getvalue())}
+            raise _no_such_key()
+        self.s3.get_object.side_effect = get_object
+
+        self.trade_logger.log_trade(_trade("NEW1"))
+        self.trade_logger.flush()
+
+        self.assertEqual(self.s3.put_object.call_args.kwargs["Key"], csv_key)
+        lines = self.uploaded_csv().splitlines()
+        self.assertEqual(lines[0], ",".join(Trade.COLUMNS))
+        self.assertIn("OLD1", lines[1])
+        self.assertIn("NEW1", lines[2])
+        self.assertEqual(len(lines), 3)
+
+
+class BatchingTest(TradeLoggerTestCase):
+
+    def test_full_batch_uploads_without_waiting(self):
+        self.trade_logger.FLUSH_INTERVAL = 60
+        for i in range(TradeLogger.BATCH_SIZE - 1):
+            self.trade_logger.log_trade(_trade(f"ORD{i}"))
+        self.s3.put_object.assert_not_called()
+
+        self.trade_logger.log_trade(_trade("LAST"))
+
+        self.s3.put_object.assert_called_once()
+        self.assertEqual(len(self.uploaded_csv().splitlines()), TradeLogger.BATCH_SIZE + 1)
+
+    def test_timer_uploads_partial_batch(self):
+        self.trade_logger.FLUSH_INTERVAL = 0.05
+        self.trade_logger.log_trade(_trade("ORD1"))
+
+        deadline = time.monotonic() + 5
+        while not self.s3.put_object.called and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        self.s3.put_object.assert_called_once()
+        self.assertIn("ORD1", self.uploaded_csv())
+
+
+class ExitFlushTest(unittest.TestCase):
+
+    def test_trade_pending_at_exit_is_logged(self):
+        # Exit handlers only run at interpreter shutdown, so exercise them in a child process
+        script = textwrap.dedent("""
+            from unittest import mock
+
+            from botocore.exceptions import ClientError
+
+            from algo_trader.logging import trade_logger
+            from algo_trader.models import Trade
+            from algo_trader.notifications import notification_service
+
+            s3 = mock.MagicMock()
+            s3.get_object.side_effect = ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject")
+            trade_logger.get_client = lambda *args: s3
+            notification_service.get_client = lambda *args: mock.MagicMock()
+            notification_service._get_telegram_token = lambda: None
+
+            trade = Trade(account_id="U1", action="Buy", symbol="TQQQ", dollar_amount=100.0, shares=2.0)
+            trade_logger.TradeLogger().log_trade(trade)
+        """)
+        result = subprocess.run([sys.executable, "-c", script], cwd=PROJECT_ROOT,
+                                capture_output=True, text=True, timeout=60)
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn("Logged 1 trade(s) to s3://", result.stdout)
+        self.assertIn("Email notification sent", result.stdout)
+
+
+if __name__ == "__main__":
+    unittest.main()